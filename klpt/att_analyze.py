@@ -8,8 +8,10 @@
     return the strings in order cheapest first.  The apply functions work as a generator,
     yielding output strings as long as there is a valid transduction.  Input files are
     standard AT&T format, with the last column being optionally a weight.  The files can be
-    compressed with gzip.  The apply generator produces tuples of (output, weight). For
-    unweighted automata/transducers, the weight is always 0.0.
+    compressed with gzip.  They are compiled into a binary image which is cached in the
+    user's cache directory (~/.cache/klpt) or, if it is not writable, next to them and
+    memory-mapped, so that loading a transducer is cheap.  The apply generator produces
+    tuples of (output, weight). For unweighted automata/transducers, the weight is always 0.0.
 
     Example usage:
 
@@ -26,161 +28,472 @@
     Last Update: 11/07/2016
 """
 
-import json
+import os
 import sys
-import re
+import mmap
+import gzip
+import struct
+import hashlib
+import tempfile
+import multiprocessing
 sys.path.append('../klpt')
 import klpt
+from klpt import utility
 
-import codecs, gzip
+from array import array
 from heapq import *
 
-class State:
-    def __init__(self):
-        self.final = False
-        self.finalweight = 0.0
-        self.transitionsin = {}
-        self.transitionsout = {}
-
-    def add_transition(self, target, input, output, weight):
-        if input not in self.transitionsin:
-            self.transitionsin[input] = []
-        if output not in self.transitionsout:
-            self.transitionsout[output] = []
-        self.transitionsin[input].append((output, target, weight))
-        self.transitionsout[output].append((input, target, weight))
-
-    def get_transitions(self, symbol, dir = 'down'):
-        if dir == 'down':
-            s = self.transitionsin
-        else:
-            s = self.transitionsout
-        if symbol in s:
-            return s[symbol]
-        else:
-            return []
+ATT_HEADER = struct.Struct("<8s8s16sIIIII4x")
+ATT_MAGIC = b"KLPTATT2"
+
+def att_digest(source, epsilon_symbol = u'@0@'):
+
+    """The digest of the content of an AT&T file by which compiled images are validated."""
+
+    return hashlib.blake2b(source, digest_size = 16, key = epsilon_symbol.encode("utf-8")).digest()
+
+def compile_att(source, epsilon_symbol = u'@0@'):
+
+    """Compiles the content of an AT&T file (possibly gzipped) into the binary
+    image loaded by ATTFST. Symbols are interned, the epsilon symbol being 0,
+    and the transitions of each direction are stored as CSR arrays: per state,
+    an offset into the transitions sorted by the symbol they match, with the
+    symbol they emit, their target and their weight. The image starts with a
+    digest of the source so that a cached image can be checked against it, and
+    whether any weight is not 0.0, in which case the machine is weighted."""
+
+    if source[:2] == b"\x1f\x8b":
+        text = gzip.decompress(source).decode("utf-8", errors = "replace")
+    else:
+        text = source.decode("utf-8", errors = "replace")
+    symbol_ids = {u'': 0}
+    transitions, finals = [], {}
+    state_count = 0
+    for l in text.split('\n'):
+        fields = l.split('\t')
+        if len(fields) > 3:
+            source_state, target = int(fields[0]), int(fields[1])
+            insym, outsym = [symbol_ids.setdefault(u'' if s == epsilon_symbol else s, len(symbol_ids)) for s in fields[2:4]]
+            weight = float(fields[4]) if len(fields) > 4 else 0.0
+            transitions.append((source_state, target, insym, outsym, weight))
+            state_count = max(state_count, source_state + 1, target + 1)
+        elif len(fields) < 3 and fields[0]:
+            final = int(fields[0])
+            finals[final] = float(fields[1]) if len(fields) > 1 else 0.0
+            state_count = max(state_count, final + 1)
+
+    final_flags, final_weights = bytearray(state_count), array("d", [0.0]) * state_count
+    for state, weight in finals.items():
+        final_flags[state], final_weights[state] = 1, weight
+    weights, indices = [], []
+    for match, emit in [(2, 3), (3, 2)]: # down matches the input side, up the output side
+        order = sorted(range(len(transitions)), key = lambda i: (transitions[i][0], transitions[i][match]))
+        offsets = array("I", [0]) * (state_count + 1)
+        for source_state, _, _, _, _ in transitions:
+            offsets[source_state + 1] += 1
+        for state in range(state_count):
+            offsets[state + 1] += offsets[state]
+        weights.append(array("d", [transitions[i][4] for i in order]))
+        indices += [offsets, array("I", [transitions[i][match] for i in order]), array("I", [transitions[i][emit] for i in order]), 
+                    array("I", [transitions[i][1] for i in order])]
 
-    def set_final(self, finalweight):
-        self.final = True
-        self.finalweight = finalweight
+    symbols = [symbol.encode("utf-8") for symbol in symbol_ids]
+    symbol_offsets = array("I", [0])
+    for symbol in symbols:
+        symbol_offsets.append(symbol_offsets[-1] + len(symbol))
+    weighted = any(weight != 0.0 for weight in finals.values()) or any(transition[4] != 0.0 for transition in transitions)
+    header = ATT_HEADER.pack(ATT_MAGIC, sys.byteorder.encode("ascii"), att_digest(source, epsilon_symbol), state_count, len(transitions), len(symbols), 
+                             symbol_offsets[-1], weighted)
+    return b"".join([header] + [section.tobytes() for section in [final_weights] + weights + indices + [symbol_offsets]] + 
+                    [bytes(final_flags)] + symbols)
 
 class ATTFST:
 
-    def __init__(self, attfile, epsilon_symbol = u'@0@', identity_symbol = u'@_IDENTITY_SYMBOL_@', unknown_symbol = '@_UNKNOWN_SYMBOL_@'):
+    def __init__(self, attfile, epsilon_symbol = u'@0@', identity_symbol = u'@_IDENTITY_SYMBOL_@', unknown_symbol = '@_UNKNOWN_SYMBOL_@', cache_file = None, token_cache_size = 100000):
 
         """Reads an AT&T file (possibly gzipped) and inits data structures
         to apply() can be called.  If the AT&T file contains the special symbols
         epsilon, identity (repeat unknown) or unknown (one-sided unknown), these
-        can be specified. The defaults are what foma produces with write att."""
+        can be specified. The defaults are what foma produces with write att.
+        The file is compiled by compile_att() once and cached in cache_file,
+        by default in the user's cache directory ($XDG_CACHE_HOME/klpt or
+        ~/.cache/klpt) or, if it is not writable, next to the AT&T file, e.g. in
+        the data directory of the package. The cache is memory-mapped, so that it is
+        loaded in a few milliseconds and shared by processes, and recompiled when
+        the AT&T file changes. If cache_file is False, nothing is written.
+        The tokenization of up to token_cache_size words is cached (None for
+        no limit, 0 to disable the cache)."""
 
         self.epsilon_symbol = epsilon_symbol
         self.identity_symbol = identity_symbol
         self.unknown_symbol = unknown_symbol
+        with open(attfile, "rb") as f:
+            source = f.read()
+        digest = att_digest(source, epsilon_symbol)
+        if cache_file is None:
+            cache_dir = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"), "klpt")
+            path_hash = hashlib.blake2b(os.path.abspath(attfile).encode("utf-8"), digest_size = 4).hexdigest()
+            cache_files = [os.path.join(cache_dir, "%s-%s.bin" % (os.path.basename(attfile), path_hash)), attfile + ".bin"]
+        else:
+            cache_files = [cache_file] if cache_file else []
+
+        self.buffer = None
+        for path in cache_files:
+            self.buffer = self._map_cache(path, digest)
+            if self.buffer is not None:
+                break
+        if self.buffer is None:
+            image = compile_att(source, epsilon_symbol)
+            for path in cache_files:
+                directory = os.path.dirname(os.path.abspath(path))
+                try:
+                    os.makedirs(directory, exist_ok = True)
+                    fd, temporary_path = tempfile.mkstemp(dir = directory)
+                except OSError:
+                    continue
+                try:
+                    with os.fdopen(fd, "wb") as f:
+                        f.write(image)
+                    os.chmod(temporary_path, 0o644)
+                    os.replace(temporary_path, path)
+                except OSError:
+                    os.remove(temporary_path)
+                    continue
+                self.buffer = self._map_cache(path, digest)
+                if self.buffer is not None:
+                    break
+            if self.buffer is None:
+                self.buffer = image
+        self._load(self.buffer)
+        # tokens of the words, keyed on the word. Use `token_cache.info()` to get the statistics of the cache.
+        self.token_cache = utility.LRUCache(token_cache_size)
+
+    def _map_cache(self, path, digest):
         try:
-            lines = [line.rstrip('\n') for line in codecs.getreader("utf-8")(gzip.open(attfile, encoding = "utf-8"), errors='replace')]
-        except:
-            f_lines = codecs.open(attfile, "r", encoding = "utf-8")
-            lines = [line.rstrip('\n') for line in f_lines]
-            f_lines.close()
-        self.states = {}
-        self.alphabet = set()
-        for l in lines:
-            fields = l.split('\t')
-            if len(fields) > 3:
-                fields = l.split('\t')
-                source = int(fields[0])
-                target = int(fields[1])
-                insym = self._map_syms(fields[2])
-                outsym = self._map_syms(fields[3])
-                if len(fields) > 4:
-                    weight = float(fields[4])
-                else:
-                    weight = 0.0
-                self.alphabet.add(insym)
-                self.alphabet.add(outsym)
-                if int(source) not in self.states:
-                    nss = State()
-                    self.states[source] = nss
-                if int(target) not in self.states:
-                    nst = State()
-                    self.states[target] = nst
-                self.states[source].add_transition(target, insym, outsym, weight)
-            elif len(fields) < 3 and len(fields) > 0:
-                final = int(fields[0])
-                finalweight = 0.0
-                if len(fields) > 1:
-                    finalweight = float(fields[1])
-                if final not in self.states:
-                    nss = State()
-                    self.states[final] = nss
-                self.states[final].set_final(finalweight)
-
-    def _map_syms(self, s):
-        if s == self.epsilon_symbol:
-            return u''
-        return s
+            with open(path, "rb") as f:
+                buffer = mmap.mmap(f.fileno(), 0, access = mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        if len(buffer) >= ATT_HEADER.size:
+            magic, byteorder, cached_digest, state_count, transition_count, symbol_count, symbols_size, _ = ATT_HEADER.unpack_from(buffer)
+            size = ATT_HEADER.size + 8 * (state_count + 2 * transition_count) + 4 * (2 * (state_count + 1 + 3 * transition_count) + symbol_count + 1) + state_count + symbols_size
+            if magic == ATT_MAGIC and byteorder.rstrip(b"\0").decode("ascii") == sys.byteorder and cached_digest == digest and len(buffer) == size:
+                return buffer
+        buffer.close()
+        return None
+
+    def _load(self, buffer):
+        _, _, _, state_count, transition_count, symbol_count, symbols_size, weighted = ATT_HEADER.unpack_from(buffer)
+        self.weighted = bool(weighted)
+        view = memoryview(buffer)
+        start = ATT_HEADER.size
+        sections = []
+        for typecode, length in [("d", state_count), ("d", transition_count), ("d", transition_count)] + \
+                                [("I", state_count + 1), ("I", transition_count), ("I", transition_count), ("I", transition_count)] * 2 + \
+                                [("I", symbol_count + 1), ("B", state_count)]:
+            size = length * array(typecode).itemsize
+            sections.append(view[start: start + size].cast(typecode))
+            start += size
+        self.final_weights, down_weights, up_weights = sections[:3]
+        self.transitions = {'down': tuple(sections[3:7]) + (down_weights,), 'up': tuple(sections[7:11]) + (up_weights,)}
+        symbol_offsets, self.finals = sections[11:]
+        self.symbols = [view[start + symbol_offsets[i]: start + symbol_offsets[i + 1]].tobytes().decode("utf-8") for i in range(symbol_count)]
+        symbol_offsets.release()
+        self.sections = sections[:11] + [self.finals, view]
+        self.symbol_ids = {symbol: symbol_id for symbol_id, symbol in enumerate(self.symbols)}
+        self.alphabet = set(self.symbols)
+        self.symbol_trie = utility.build_affix_trie([symbol for symbol in self.symbols if symbol])
+        self.identity_id = self.symbol_ids.get(self.identity_symbol)
+        self.unknown_id = self.symbol_ids.get(self.unknown_symbol)
+        # transitions of the states keyed on the symbol they match and epsilon closures of the states, per direction.
+        # They are built when a state is first reached or by prepare().
+        self.state_transitions = {'down': {}, 'up': {}}
+        self.closures = {'down': {}, 'up': {}}
+
+    def _transitions(self, state, dir):
+        """The transitions of a state as a dictionary of the matched symbol ids and lists of (emitted symbol id, emitted symbol, target, weight)."""
+        state_transitions = self.state_transitions[dir].get(state)
+        if state_transitions is None:
+            offsets, matched, emitted, targets, weights = self.transitions[dir]
+            state_transitions = {}
+            for t in range(offsets[state], offsets[state + 1]):
+                state_transitions.setdefault(matched[t], []).append((emitted[t], self.symbols[emitted[t]], targets[t], weights[t]))
+            self.state_transitions[dir][state] = state_transitions
+        return state_transitions
+
+    def _closure(self, state, dir):
+        """The epsilon closure of a state as a list of (state, emitted symbols, cost, transitions of the state) reached
+        by the epsilon paths starting from the state, itself included, which do not visit a state twice."""
+        closure = self.closures[dir].get(state)
+        if closure is None:
+            closure = [(state, (), 0.0, self._transitions(state, dir))]
+            stack = [(state, (), 0.0, (state,))]
+            while stack:
+                source, output, cost, path = stack.pop()
+                for _, outsym, target, weight in self._transitions(source, dir).get(0, ()):
+                    if target not in path:
+                        closure.append((target, output + (outsym,), cost + weight, self._transitions(target, dir)))
+                        stack.append((target, output + (outsym,), cost + weight, path + (target,)))
+            self.closures[dir][state] = closure
+        return closure
+
+    def prepare(self, dir = None):
+
+        """Builds the transitions by symbol and the epsilon closures of all the
+        states in a direction, or both if dir is None, instead of building them
+        when the states are first reached, e.g. before forking workers."""
+
+        for direction in ['down', 'up'] if dir is None else ['down' if dir == 'down' else 'up']:
+            for state in range(len(self.finals)):
+                self._closure(state, direction)
+
+    def close(self):
+
+        """Releases the memory-mapped cache."""
+
+        for section in self.sections:
+            section.release()
+        if isinstance(self.buffer, mmap.mmap):
+            self.buffer.close()
 
     def tokenize(self, word):
+        return list(self._tokenize(word))
+
+    def _tokenize(self, word):
+        tokens = self.token_cache.get(word)
+        if tokens is not None:
+            return tokens
         tokens = []
         start = 0
         while start < len(word):
-            t = word[start]
-            for length in range(1, len(word) - start + 1):
-                if word[start:start+length] in self.alphabet:
-                    t = word[start:start+length]
-            tokens.append(t)
-            start += len(t)
+            # walk the trie of the alphabet for the longest symbol starting here
+            length, node = 1, self.symbol_trie
+            for i in range(start, len(word)):
+                node = node.get(word[i])
+                if node is None:
+                    break
+                if None in node:
+                    length = i - start + 1
+            tokens.append(word[start:start+length])
+            start += length
+        tokens = tuple(tokens)
+        self.token_cache.put(word, tokens)
         return tokens
 
-    def apply(self, word, dir = 'down', tokenizer = None, return_joined = True):
+    def apply(self, word, dir = 'down', tokenizer = None, return_joined = True, max_results = None, max_states = None, max_cost = None):
 
         """Main apply function. Tokenizer func can be passed to the function.
         If no tokenizer is given, the alphabet of the FSM is used for
         tokenization of the input string, longest-match (as in foma).
         By default, the dir = 'down'. The output is by default joined,
         but a list of tokens can also be produced if return_joined is
-        False."""
+        False. Epsilon transitions are followed through the precomputed
+        epsilon closures of the states, which do not visit a state twice
+        so that epsilon cycles cannot loop. Unweighted machines are searched
+        depth-first, weighted ones cheapest first. Results of the same weight
+        are yielded in the order they are found. The search stops after
+        max_results results or max_states explored states and ignores paths
+        costing more than max_cost. The number of explored states is kept in
+        self.explored and self.truncated tells whether the search was stopped
+        by max_results or max_states."""
 
         if tokenizer == None:
-            w = self.tokenize(word)
+            w = self._tokenize(word)
         else:
             w = tokenizer(word)
+        dir = 'down' if dir == 'down' else 'up'
+        # ids of the symbols matching each token, the unknown and identity symbols for tokens outside the alphabet
+        inputs = [(self.symbol_ids[token],) if token in self.alphabet else 
+                  tuple(symbol_id for symbol_id in [self.unknown_id, self.identity_id] if symbol_id is not None) for token in w]
+        self.explored, self.truncated = 0, False
+        if self.weighted:
+            results = self._search_weighted(w, inputs, dir, max_results, max_states, max_cost)
+        elif max_cost is None or max_cost >= 0.0:
+            results = self._search(w, inputs, dir, max_results, max_states)
+        else:
+            results = []
+        # outputs are shared cons cells (head, tail) which are only materialized for the results
+        for output, cost in results:
+            tokens = []
+            while output is not None:
+                tokens.append(output[0])
+                output = output[1]
+            tokens.reverse()
+            if return_joined == True:
+                yield(''.join(tokens), cost)
+            else:
+                yield(tokens, cost)
+
+    def _emit(self, symbol_id, outsym, token):
+        if symbol_id == self.identity_id:
+            return token
+        elif symbol_id == self.unknown_id:
+            return u'?'
+        return outsym
+
+    def _search(self, w, inputs, dir, max_results, max_states):
+        finals, special_ids, closures = self.finals, (self.identity_id, self.unknown_id), self.closures[dir]
+        stack = [(0, 0, None)] # (state, position, output)
+        results = 0
+        while stack:
+            state, position, output = stack.pop()
+            for closure_state, epsilon_output, _, state_transitions in closures.get(state) or self._closure(state, dir):
+                if max_states is not None and self.explored >= max_states:
+                    self.truncated = True
+                    return
+                self.explored += 1
+                closure_output = output
+                for outsym in epsilon_output:
+                    closure_output = (outsym, closure_output)
+                if position == len(w):
+                    if finals[closure_state]:
+                        yield(closure_output, 0.0)
+                        results += 1
+                        if max_results is not None and results >= max_results:
+                            self.truncated = True
+                            return
+                    continue
+                for symbol_id in inputs[position]:
+                    for emitted, outsym, target, _ in state_transitions.get(symbol_id, ()):
+                        if emitted in special_ids:
+                            outsym = self._emit(emitted, outsym, w[position])
+                        stack.append((target, position + 1, (outsym, closure_output)))
+
+    def _search_weighted(self, w, inputs, dir, max_results, max_states, max_cost):
+        finals, final_weights, special_ids, closures = self.finals, self.final_weights, (self.identity_id, self.unknown_id), self.closures[dir]
         heap = []
-        heappush(heap, (0.0, 0, [], 0, False)) # (cost, -pos, output, state, final_included), use negpos to serve as tiebreaker
+        count = 0
+        heappush(heap, (0.0, 0, count, 0, None, False)) # (cost, -pos, tiebreaker, state, output, final_included), use negpos to serve as tiebreaker
+        results = 0
         while len(heap) > 0:
-            cost, negpos, output, state, final_included = heappop(heap)
+            cost, negpos, _, state, output, final_included = heappop(heap)
             if final_included == True:
-                if return_joined == True:
-                    yield(''.join(output), cost)
-                else:
-                    yield(output, cost)
-            else:
-                if -negpos == len(w):
-                    # only match epsilon or finaladd
-                    if final_included == False:
-                        for outsym, target, weight in self.states[state].get_transitions('', dir = dir):
-                            heappush(heap, (cost + weight, negpos, output + [outsym], target, False))
-                    if self.states[state].final == True:
-                        heappush(heap, (cost + self.states[state].finalweight, negpos, output, state, True))
-                else: # Match other symbols as well
-                    nextsym = [w[-negpos]]
-                    if w[-negpos] not in self.alphabet:
-                        nextsym = [self.unknown_symbol, self.identity_symbol]
-                    for ns in nextsym:
-                        for outsym, target, weight in self.states[state].get_transitions(ns, dir = dir):
-                            if outsym == self.identity_symbol:
-                                outsym = w[-negpos]
-                            elif outsym == self.unknown_symbol:
-                                outsym = u'?'
-                            heappush(heap, (cost + weight, negpos - 1, output + [outsym], target, False))
-                    for outsym, target, weight in self.states[state].get_transitions('', dir = dir): # Epsilons
-                        heappush(heap, (cost + weight, negpos, output + [outsym], target, False))
+                yield(output, cost)
+                results += 1
+                if max_results is not None and results >= max_results:
+                    self.truncated = True
+                    return
+                continue
+            position = -negpos
+            for closure_state, epsilon_output, epsilon_cost, state_transitions in closures.get(state) or self._closure(state, dir):
+                if max_cost is not None and cost + epsilon_cost > max_cost:
+                    continue
+                if max_states is not None and self.explored >= max_states:
+                    self.truncated = True
+                    return
+                self.explored += 1
+                closure_output = output
+                for outsym in epsilon_output:
+                    closure_output = (outsym, closure_output)
+                if position == len(w):
+                    if finals[closure_state] and (max_cost is None or cost + epsilon_cost + final_weights[closure_state] <= max_cost):
+                        count += 1
+                        heappush(heap, (cost + epsilon_cost + final_weights[closure_state], negpos, count, closure_state, closure_output, True))
+                    continue
+                for symbol_id in inputs[position]:
+                    for emitted, outsym, target, weight in state_transitions.get(symbol_id, ()):
+                        if max_cost is not None and cost + epsilon_cost + weight > max_cost:
+                            continue
+                        if emitted in special_ids:
+                            outsym = self._emit(emitted, outsym, w[position])
+                        count += 1
+                        heappush(heap, (cost + epsilon_cost + weight, negpos - 1, count, target, (outsym, closure_output), False))
+
+    def apply_many(self, words, dir = 'down', tokenizer = None):
+
+        """Applies the machine to many words at once. The words are deduplicated
+        and their tokens are put in a trie which is walked along the machine, so
+        that the states reached by a prefix shared by several words are explored
+        once. Returns a dictionary of the words and the lists of (output, weight)
+        that apply() yields for them. Weighted machines are applied word by word
+        so that the results are ordered by weight."""
+
+        words = sorted(set(words))
+        if self.weighted:
+            return {word: list(self.apply(word, dir = dir, tokenizer = tokenizer)) for word in words}
+        dir = 'down' if dir == 'down' else 'up'
+        # trie of the tokens of the words where the words are stored under the None key
+        trie = {}
+        for word in words:
+            node = trie
+            for token in (self._tokenize(word) if tokenizer == None else tokenizer(word)):
+                node = node.setdefault(token, {})
+            node.setdefault(None, []).append(word)
+        inputs = {}
+        finals, special_ids, closures = self.finals, (self.identity_id, self.unknown_id), self.closures[dir]
+        results = {word: [] for word in words}
+        stack = [(0, trie, None)] # (state, trie node, output)
+        while stack:
+            state, node, output = stack.pop()
+            for closure_state, epsilon_output, _, state_transitions in closures.get(state) or self._closure(state, dir):
+                closure_output = output
+                for outsym in epsilon_output:
+                    closure_output = (outsym, closure_output)
+                if None in node and finals[closure_state]:
+                    tokens = []
+                    tail = closure_output
+                    while tail is not None:
+                        tokens.append(tail[0])
+                        tail = tail[1]
+                    result = (''.join(reversed(tokens)), 0.0)
+                    for word in node[None]:
+                        results[word].append(result)
+                for token, child in node.items():
+                    if token is None:
+                        continue
+                    if token not in inputs:
+                        inputs[token] = (self.symbol_ids[token],) if token in self.alphabet else \
+                                        tuple(symbol_id for symbol_id in [self.unknown_id, self.identity_id] if symbol_id is not None)
+                    for symbol_id in inputs[token]:
+                        for emitted, outsym, target, _ in state_transitions.get(symbol_id, ()):
+                            if emitted in special_ids:
+                                outsym = self._emit(emitted, outsym, token)
+                            stack.append((target, child, (outsym, closure_output)))
+        return results
+
 
+# Analysis object of a worker process of `Analysis.analyze_many`
+worker_analysis = None
+
+def init_analysis_worker(dialect, script):
+    """Load the Analysis object of a worker process of `Analysis.analyze_many`. The compiled transducer is memory-mapped, so its pages are shared."""
+    global worker_analysis
+    worker_analysis = Analysis(dialect, script)
+
+def analyze_in_worker(words):
+    """Analyses of a shard of words in a worker process of `Analysis.analyze_many`"""
+    return worker_analysis.analyze_many(words)
 
 class Analysis:
     def __init__(self, dialect="Kurmanji", script="Latin"):
+        self.dialect = dialect
+        self.script = script
         self.t = ATTFST(klpt.get_data("data/kmr-Latn.att"))
 
-    def analyze(self, word):
-        return list(self.t.apply(word, dir='down'))
+    def analyze(self, word, max_results=None, max_states=None, max_cost=None):
+        """Analyses of a word sorted by their weight and then alphabetically. The limits are those of `ATTFST.apply`."""
+        return sorted(self.t.apply(word, dir='down', max_results=max_results, max_states=max_states, max_cost=max_cost), key=lambda analysis: (analysis[1], analysis[0]))
+
+    def analyze_many(self, words, workers=None):
+        """Analyses of many words, e.g. a vocabulary, sorted as those of `analyze`. The words are deduplicated and sorted, and a prefix shared
+        by several words is analysed once (see `ATTFST.apply_many`).
+
+        Args:
+            words ([list]): [a list of words]
+            workers (int, optional): [number of worker processes which analyse contiguous shards of the sorted words]. Defaults to None, 
+                the words being analysed in this process.
 
+        Returns:
+            [dict]: [the words and their analyses]
+        """
+        words = sorted(set(words))
+        if workers is None or workers < 2 or len(words) < 2:
+            return {word: sorted(analyses, key=lambda analysis: (analysis[1], analysis[0])) for word, analyses in self.t.apply_many(words).items()}
+        # a few shards per worker to balance their load
+        shard_size = -(-len(words) // (4 * workers))
+        shards = [words[i: i + shard_size] for i in range(0, len(words), shard_size)]
+        analyses = dict()
+        with multiprocessing.Pool(workers, initializer=init_analysis_worker, initargs=(self.dialect, self.script)) as pool:
+            for shard_analyses in pool.imap(analyze_in_worker, shards):
+                analyses.update(shard_analyses)
+        return analyses
@@ -27,7 +27,7 @@ class Preprocess:
     - `unify_numerals`: conversion of the various types of numerals used in Kurdish texts
     - `preprocess`: one single function for normalization, standardization and unification of numerals
 
-    In addition, it is possible to remove stopwords using the `stopwords` variable. It is better to remove stopwords after the tokenization task.
+    In addition, it is possible to remove stopwords using `remove_stopwords` (or `remove_stopwords_stream` for a stream of token lists) or the `stopwords` variable. It is better to remove stopwords after the tokenization task.
 
     It is recommended that the output of this module be used as the input of subsequent tasks in an NLP pipeline.
     
@@ -53,11 +53,20 @@ class Preprocess:
     'hêvîya'
     >>> preprocessor_kmr.stopwords[:10]
     ['a', 'an', 'bareya', 'bareyê', 'barên', 'basa', 'be', 'belê', 'ber', 'bereya']
+    >>> preprocessor_kmr.remove_stopwords(['▁ez▁', '▁ji▁', '▁te▁', '▁hez▁', '▁dik▁im'])
+    ['▁te▁', '▁hez▁', '▁dik▁im']
     ```
 
     The preprocessing rules are provided at [`data/preprocess_map.json`](https://github.com/sinaahmadi/klpt/blob/master/klpt/data/preprocess_map.json).
     """
 
+    # compiled normalization and standardization rules of each (dialect, script)
+    compiled_rules = dict()
+    # (numeral, target numeral) pairs and their UTF-8 encodings for each target numeral
+    numeral_tables = dict()
+    # stopwords of each (dialect, script) as a list and as a frozenset for lookups
+    stopword_indexes = dict()
+
     def __init__(self, dialect, script, numeral="Latin"):
         """
         Initialization of the Preprocess class
@@ -75,10 +84,125 @@ class Preprocess:
         self.dialect = configuration.dialect
         self.script = configuration.script
         self.numeral = configuration.numeral
+
+        if self.numeral not in Preprocess.numeral_tables:
+            numerals = self.preprocess_map["normalizer"]["universal"]["numerals"][self.numeral]
+            Preprocess.numeral_tables[self.numeral] = (list(numerals.items()), [(i.encode("utf-8"), j.encode("utf-8")) for i, j in numerals.items()])
+        self.numeral_pairs, self.numeral_byte_pairs = Preprocess.numeral_tables[self.numeral]
         # self.preprocess_map = config.preprocess_map
 
-        with open(klpt.data_directory["stopwords"], "r", encoding = "utf-8") as f:
-            self.stopwords = json.load(f)[dialect][script]
+        if (self.dialect, self.script) not in Preprocess.stopword_indexes:
+            with open(klpt.data_directory["stopwords"], "r", encoding = "utf-8") as f:
+                stopwords = json.load(f)[self.dialect][self.script]
+            Preprocess.stopword_indexes[(self.dialect, self.script)] = (stopwords, frozenset(stopwords))
+        self.stopwords = list(Preprocess.stopword_indexes[(self.dialect, self.script)][0])
+        self.stopword_index = Preprocess.stopword_indexes[(self.dialect, self.script)][1]
+
+        # the rules are compiled once per dialect and script and shared by all the instances
+        if (self.dialect, self.script) not in Preprocess.compiled_rules:
+            normalizer_rules = list(self.preprocess_map["normalizer"]["universal"][self.script].items()) + list(self.preprocess_map["normalizer"][self.dialect][self.script].items())
+            standardizer_rules = list(self.preprocess_map["standardizer"][self.dialect][self.script].items())
+            Preprocess.compiled_rules[(self.dialect, self.script)] = {"normalizer": self.compile_rules(normalizer_rules), 
+                                                                      "standardizer": self.compile_rules(standardizer_rules),
+                                                                      "preprocess": dict()}
+        self.normalizer_rules = Preprocess.compiled_rules[(self.dialect, self.script)]["normalizer"]
+        self.standardizer_rules = Preprocess.compiled_rules[(self.dialect, self.script)]["standardizer"]
+        if self.numeral not in Preprocess.compiled_rules[(self.dialect, self.script)]["preprocess"]:
+            Preprocess.compiled_rules[(self.dialect, self.script)]["preprocess"][self.numeral] = self.compile_preprocess_rules()
+        self.preprocess_rules = Preprocess.compiled_rules[(self.dialect, self.script)]["preprocess"][self.numeral]
+
+    def compile_rules(self, rules):
+        """
+        Compile the rules of the preprocessing map into a plan of replacements
+
+        The rules are applied one after another in the order of the map and each rule is compiled once as a case-insensitive regular expression. 
+        A pattern of several characters is only applied if the text contains the characters without case which any of its matches contains, 
+        e.g. "'" in "(\\d)'(an)" or "¨" in "¨u": looking for a character is a fast scan whereas a pattern starting with a class like "\\d" or 
+        a cased character is tested at every position of the text.
+
+        Arguments:
+            rules (list): (pattern, replacement) pairs in the order of application
+
+        Returns:
+            list: (guard characters, compiled pattern, replacement) steps
+
+        """
+        return [(self.guard_characters(rep) if len(rep) > 1 else "", re.compile(rf"{rep}", flags=re.I), rf"{rep_tar}") for rep, rep_tar in rules]
+
+    def guard_characters(self, pattern):
+        """
+        Find the characters without case which any match of a regular expression contains, i.e. the literals outside groups and quantifiers
+
+        Arguments:
+            pattern (str): a regular expression
+
+        Returns:
+            str: the characters, empty for alternatives, sets and counted repetitions which are not analyzed
+
+        """
+        if any(char in pattern for char in "|[{"):
+            return ""
+        characters, depth, i = "", 0, 0
+        while i < len(pattern):
+            char = pattern[i]
+            if char == "\\":
+                i += 2
+                continue
+            if char == "(":
+                depth += 1
+            elif char == ")":
+                depth -= 1
+            elif depth == 0 and char not in ".^$*+?" and char.lower() == char.upper() == char and pattern[i + 1:i + 2] not in ["*", "?"]:
+                characters += char
+            i += 1
+        return characters
+
+    def compile_preprocess_rules(self):
+        """
+        Fuse the unification of numerals, the normalization and the standardization into one plan for `preprocess`
+
+        `unify_numerals(standardize(normalize(text)))` unifies the numerals three times. Here, they are unified once at the beginning 
+        and again after the normalization and the standardization only if a replacement of these rules contains a numeral to be converted, 
+        e.g. never for the rules of preprocess_map.json.
+
+        Returns:
+            list: compiled rules where a (None, None, None) step strips the text and pads it with a space as between `normalize` and `standardize`
+
+        """
+        # numerals are replaced by str.replace as in `unify_numerals`
+        numeral_steps = [("", i, j) for i, j in self.numeral_pairs]
+
+        def introduces_numerals(plan):
+            return any(numeral in replacement for _, _, replacement in plan for numeral, _ in self.numeral_pairs)
+
+        plan = numeral_steps + self.normalizer_rules
+        if introduces_numerals(self.normalizer_rules):
+            plan += numeral_steps
+        plan += [(None, None, None)] + self.standardizer_rules
+        if introduces_numerals(self.standardizer_rules):
+            plan += numeral_steps
+        return plan
+
+    def apply_rules(self, plan, text):
+        """
+        Apply a plan of replacements compiled by `compile_rules` or `compile_preprocess_rules`
+
+        Arguments:
+            plan (list): compiled rules
+            text (str): a string
+
+        Returns:
+            str: text after the replacements
+
+        """
+        for guard, pattern, replacement in plan:
+            if pattern is None:
+                text = " " + text.strip() + " "
+            elif isinstance(pattern, str):
+                text = text.replace(pattern, replacement)
+            elif all(char in text for char in guard):
+                text = pattern.sub(replacement, text)
+        return text
 
     def standardize(self, text):
         """
@@ -106,13 +230,7 @@ class Preprocess:
 
         """
         temp_text = " " + self.unify_numerals(text) + " "
-
-        for standardization_type in [self.dialect]:
-            for rep in self.preprocess_map["standardizer"][standardization_type][self.script]:
-                rep_tar = self.preprocess_map["standardizer"][standardization_type][self.script][rep]
-                temp_text = re.sub(rf"{rep}", rf"{rep_tar}", temp_text, flags=re.I)
-
-        return temp_text.strip()
+        return self.apply_rules(self.standardizer_rules, temp_text).strip()
 
     def normalize(self, text):
         """
@@ -139,13 +257,7 @@ class Preprocess:
 
          """
         temp_text = " " + self.unify_numerals(text) + " "
-
-        for normalization_type in ["universal", self.dialect]:
-            for rep in self.preprocess_map["normalizer"][normalization_type][self.script]:
-                rep_tar = self.preprocess_map["normalizer"][normalization_type][self.script][rep]
-                temp_text = re.sub(rf"{rep}", rf"{rep_tar}", temp_text, flags=re.I)
-
-        return temp_text.strip()
+        return self.apply_rules(self.normalizer_rules, temp_text).strip()
 
     def unify_numerals(self, text):
         """
@@ -156,25 +268,77 @@ class Preprocess:
         - Farsi [۱۲۳۴۵۶۷۸۹۰]
         - Latin [1234567890]
 
+        In addition to a string, a list of strings or a UTF-8 buffer (bytes, bytearray or memoryview) can be given to convert 
+        numerals in bulk. A buffer is converted without being decoded, e.g. the content of a file opened in binary mode.
+
+        Each numeral is replaced by `str.replace` (`bytes.replace` for a buffer): a pass for a numeral which is not in the text is a fast scan, 
+        whereas `str.translate` looks up every character of a text in a non-Latin script.
+
         Arguments:
-            text (str): a string
+            text (str or list or bytes): a string, a list of strings or a UTF-8 buffer
 
         Returns:
-            str: text with unified numerals
+            str: text with unified numerals (a list of strings or bytes respectively, for a list or a buffer)
 
         """
-        for i, j in self.preprocess_map["normalizer"]["universal"]["numerals"][self.numeral].items():
-            text = text.replace(i, j)
-        return text
+        if isinstance(text, str):
+            for i, j in self.numeral_pairs:
+                text = text.replace(i, j)
+            return text
+        elif isinstance(text, (bytes, bytearray, memoryview)):
+            text = bytes(text) if isinstance(text, memoryview) else text
+            for i, j in self.numeral_byte_pairs:
+                text = text.replace(i, j)
+            return text
+        return [self.unify_numerals(line) for line in text]
 
     def preprocess(self, text):
         """
         One single function for normalization, standardization and unification of numerals
 
+        The output is the same as `unify_numerals(standardize(normalize(text)))`, but the three steps are fused into one compiled plan 
+        where numerals are unified once (see `compile_preprocess_rules`).
+
         Arguments:
             text (str): a string
 
         Returns:
             str: preprocessed text
         """
-        return self.unify_numerals(self.standardize(self.normalize(text)))
+        return self.apply_rules(self.preprocess_rules, " " + text + " ").strip()
+
+    def remove_stopwords(self, tokens, separator="▁", mwe_separator="▁▁"):
+        """
+        Remove the stopwords of a list of tokens
+
+        The tokens can be plain words or the output of `Tokenize.word_tokenize` where words are delimited by `separator` 
+        as in "▁ji▁" or "▁dik▁im" and multi-word expressions by `mwe_separator`. A token is removed if the word without the markers is a stopword.
+
+        Arguments:
+            tokens (list): a list of tokens
+            separator (str): the separator used to delimit words and affixes in `Tokenize.word_tokenize`
+            mwe_separator (str): the separator used to delimit multi-word expressions in `Tokenize.word_tokenize`
+
+        Returns:
+            list: the tokens which are not stopwords
+
+        """
+        stopword_index = self.stopword_index
+        return [token for token in tokens if token not in stopword_index and 
+                (separator not in token or token.replace(mwe_separator, "").replace(separator, "") not in stopword_index)]
+
+    def remove_stopwords_stream(self, token_lists, separator="▁", mwe_separator="▁▁"):
+        """
+        Remove the stopwords of a stream of token lists, e.g. the tokenized sentences of a corpus, in the same way as `remove_stopwords`
+
+        Arguments:
+            token_lists (iterable): an iterable of lists of tokens
+            separator (str): the separator used to delimit words and affixes in `Tokenize.word_tokenize`
+            mwe_separator (str): the separator used to delimit multi-word expressions in `Tokenize.word_tokenize`
+
+        Yields:
+            list: the tokens of each list which are not stopwords
+
+        """
+        for tokens in token_lists:
+            yield self.remove_stopwords(tokens, separator, mwe_separator)
@@ -10,6 +10,14 @@ Based on the Hunspell implementation of Sorani Kurdish by Sina Ahmadi (2020)
 
 import sys
 import json
+import os
+import time
+import multiprocessing
+import multiprocessing.connection
+import threading
+import queue
+import weakref
+import itertools
 from hunspell import Hunspell
 from klpt.att_analyze import Analysis
 from klpt.configuration import Configuration
@@ -17,6 +25,352 @@ sys.path.append('../klpt')
 import klpt
 from klpt import utility
 
+# Hunspell languages of the supported dialects and scripts
+hunspell_languages = {("Sorani", "Arabic"): "ckb-Arab", ("Kurmanji", "Latin"): "kmr-Latn"}
+
+# Hunspell dictionaries and morphemes of each (dialect, script) loaded once per process and shared by the instances of Stem
+dictionary_registry = dict()
+dictionary_registry_lock = threading.Lock()
+
+def preload(dialect, script):
+    """
+    Load the Hunspell dictionary and the morphemes of a dialect and script, unless already loaded. 
+    The instances of `Stem` of the same dialect and script share them. This function is thread-safe: a dictionary is never loaded twice.
+
+    Args:
+        dialect (str): the name of the dialect
+        script (str): the name of the script
+
+    Raises:
+        Exception: only Sorani in the Arabic script and Kurmanji in the Latin script are supported
+
+    Returns:
+        dict: the Hunspell language ("language") and object ("huns"), the light verbs ("light_verbs"), the morphemes ("morphemes"), the affix tries ("prefix_trie" and "suffix_trie") 
+            and the runtime state of the Hunspell object (see `dictionary_state`)
+    """
+    if (dialect, script) not in hunspell_languages:
+        raise Exception("Sorry, only Sorani dialect in the Arabic script and Kurmanji in the Latin script is supported now. Stay tuned for other dialects and scripts!")
+
+    with dictionary_registry_lock:
+        if (dialect, script) not in dictionary_registry:
+            with open(klpt.data_directory["morphemes"][dialect], "r", encoding = "utf-8") as f_morphemes:
+                morphemes = json.load(f_morphemes)["Morphemes"]
+            dictionary_registry[(dialect, script)] = {
+                "language": hunspell_languages[(dialect, script)],
+                "huns": Hunspell(hunspell_languages[(dialect, script)], hunspell_data_dir=klpt.get_data("data/")),
+                "light_verbs": morphemes["light_verbs"][script],
+                "morphemes": morphemes["Concatenated"][script],
+                # affix tries of the rule-based stemming where suffixes are checked in the reverse order of the morpheme file (see `Stem.stem_word`)
+                "prefix_trie": utility.build_affix_trie(morphemes["Concatenated"][script]["prefixes"]),
+                "suffix_trie": utility.build_affix_trie(list(reversed(list(morphemes["Concatenated"][script]["suffixes"]))), reverse=True),
+                **dictionary_state()
+            }
+        return dictionary_registry[(dialect, script)]
+
+def dictionary_state():
+    """
+    The runtime state of a Hunspell object, shared by the instances of `Stem` using it
+
+    Returns:
+        dict: the instances of `Stem` using the Hunspell object whose caches are cleared when the dictionary is modified ("instances"), 
+            the words removed by `Stem.remove_word` which are not recognized even if Hunspell does not support forbidden words ("removed_words"),
+            the changes of `Stem.add_word` and `Stem.remove_word` in their order ("changes"), the absolute paths of the user dictionaries 
+            already applied ("user_dictionaries") and a lock of these changes ("lock")
+    """
+    return {"instances": weakref.WeakSet(), "removed_words": set(), "changes": list(), "user_dictionaries": set(), "lock": threading.RLock()}
+
+def unload(dialect, script):
+    """
+    Remove the Hunspell dictionary of a dialect and script from the registry. The instances of `Stem` already created keep using it 
+    and the next instances load it again.
+
+    Args:
+        dialect (str): the name of the dialect
+        script (str): the name of the script
+    """
+    with dictionary_registry_lock:
+        dictionary_registry.pop((dialect, script), None)
+
+class HunspellPool:
+    """
+    A bounded pool of Hunspell handles of a language which can be used by several threads at once, as a single Hunspell handle is not thread-safe. 
+
+    The functions of Hunspell are called as on a Hunspell object, e.g. `pool.stem(word)`: each call checks out a handle and returns it when done. 
+    If all the handles are in use, the call waits for one. The functions modifying the dictionary, i.e. `add`, `add_with_affix`, `add_dic` and `remove`, 
+    are applied to all the handles. Use `info()` to get the number of calls and the waiting time.
+
+    The pool is not a throughput improvement: chunspell (2.0.4) holds the GIL during the calls of Hunspell, so the calls of several threads 
+    run one at a time whatever the size of the pool, with the overhead of the checkouts. Spread the words over processes instead for throughput, 
+    e.g. with `multiprocessing` or `Stem.correct_spelling_many`.
+
+    """
+    # functions of Hunspell modifying the dictionary which are applied to all the handles
+    modifiers = {"add", "add_with_affix", "add_dic", "remove"}
+
+    def __init__(self, language, size, data_dir):
+        """
+        Args:
+            language (str): the Hunspell language, e.g. "ckb-Arab"
+            size (int): number of Hunspell handles
+            data_dir (str): the directory of the Hunspell dictionaries
+
+        """
+        if size < 1:
+            raise ValueError("The size of the pool should be a positive integer.")
+        self.size = size
+        self.handles = queue.Queue()
+        for _ in range(size):
+            self.handles.put(Hunspell(language, hunspell_data_dir=data_dir))
+        self.metrics_lock = threading.Lock()
+        # the modifiers are serialized as two of them checking out the handles at the same time could each wait for the handles of the other
+        self.modifier_lock = threading.Lock()
+        self.checkouts, self.waits, self.wait_time, self.max_wait_time = 0, 0, 0.0, 0.0
+
+    def checkout(self):
+        """Take a handle from the pool, waiting for one if all of them are in use"""
+        try:
+            handle, wait_time = self.handles.get_nowait(), 0.0
+        except queue.Empty:
+            start = time.monotonic()
+            handle = self.handles.get()
+            wait_time = time.monotonic() - start
+        with self.metrics_lock:
+            self.checkouts += 1
+            if wait_time:
+                self.waits += 1
+                self.wait_time += wait_time
+                self.max_wait_time = max(self.max_wait_time, wait_time)
+        return handle
+
+    def __getattr__(self, name):
+        if not callable(getattr(Hunspell, name)):
+            raise AttributeError(name)
+
+        if name in HunspellPool.modifiers:
+            def apply_to_all(*args, **kwargs):
+                # all the handles are checked out so that none is in use while the dictionary is modified
+                with self.modifier_lock:
+                    handles = [self.checkout() for _ in range(self.size)]
+                    try:
+                        return [getattr(handle, name)(*args, **kwargs) for handle in handles][0]
+                    finally:
+                        for handle in handles:
+                            self.handles.put(handle)
+            return apply_to_all
+
+        def apply(*args, **kwargs):
+            handle = self.checkout()
+            try:
+                return getattr(handle, name)(*args, **kwargs)
+            finally:
+                self.handles.put(handle)
+        return apply
+
+    def info(self):
+        """Statistics of the pool
+
+        Returns:
+            dict: size of the pool, number of available handles, number of calls ("checkouts"), number of calls which waited for a handle ("waits"), 
+                total and maximum waiting time in seconds
+        """
+        with self.metrics_lock:
+            return {"size": self.size, "available": self.handles.qsize(), "checkouts": self.checkouts, "waits": self.waits, 
+                    "wait_time": self.wait_time, "max_wait_time": self.max_wait_time}
+
+# Hunspell object of a worker process of `Stem.correct_spelling_many` and the words removed by `Stem.remove_word`
+worker_hunspell = None
+worker_removed_words = set()
+
+def init_suggestion_worker(huns=None, language=None, data_dir=None, changes=()):
+    """Set the Hunspell object of a worker process of `Stem.correct_spelling_many`. It is inherited if the process is forked, otherwise it is loaded 
+    and the runtime changes of the dictionary by `Stem.add_word` and `Stem.remove_word` are applied to it again."""
+    global worker_hunspell, worker_removed_words
+    worker_hunspell = huns if huns is not None else Hunspell(language, hunspell_data_dir=data_dir)
+    worker_removed_words = set()
+    for change in changes:
+        if change[0] == "add":
+            if huns is None and len(change) < 3:
+                worker_hunspell.add(change[1])
+            elif huns is None:
+                worker_hunspell.add_with_affix(change[1], change[2])
+            worker_removed_words.discard(change[1])
+        else:
+            if huns is None:
+                worker_hunspell.remove(change[1])
+            worker_removed_words.add(change[1])
+
+def suggest_in_worker(word):
+    """Spelling suggestions of a word in a worker process of `Stem.correct_spelling_many`"""
+    return [suggestion for suggestion in worker_hunspell.suggest(word) if suggestion not in worker_removed_words]
+
+def run_suggestion_worker(connection, initargs):
+    """Main loop of a worker process of `SuggestionPool`: once initialized by `init_suggestion_worker`, it sends None and then the suggestions 
+    of each word it receives until it receives None"""
+    init_suggestion_worker(*initargs)
+    try:
+        connection.send(None)
+        while True:
+            word = connection.recv()
+            if word is None:
+                break
+            connection.send(suggest_in_worker(word))
+    except (EOFError, OSError):
+        # the pool is gone
+        pass
+
+class SuggestionPool:
+    """
+    A pool of worker processes retrieving the Hunspell suggestions of words for `Stem.correct_spelling_many`
+
+    Each worker is given one word at a time and the time budget of a word starts when a worker takes it, so that the words waiting for a worker 
+    do not time out behind a slow word. A worker which exceeds the time budget of its word is terminated and replaced, the other workers are kept. 
+    The workers are started on demand up to the size of the pool and kept until `close()` is called.
+
+    """
+    def __init__(self, size, initargs):
+        """
+        Args:
+            size (int): maximum number of worker processes
+            initargs (tuple): arguments of `init_suggestion_worker` in the worker processes
+
+        """
+        if size < 1:
+            raise ValueError("The size of the pool should be a positive integer.")
+        self.size, self.initargs = size, initargs
+        # each worker is a dictionary of its process, its connection, whether it is initialized ("ready"), its word and the deadline of the word
+        self.workers = list()
+        # number of workers terminated as they exceeded a time budget
+        self.replaced = 0
+
+    def start_worker(self):
+        """Start a worker process"""
+        connection, worker_connection = multiprocessing.Pipe()
+        process = multiprocessing.Process(target=run_suggestion_worker, args=(worker_connection, self.initargs), daemon=True)
+        process.start()
+        worker_connection.close()
+        return {"process": process, "connection": connection, "ready": False, "word": None, "deadline": None}
+
+    def stop_worker(self, worker):
+        """Terminate a worker process"""
+        worker["process"].terminate()
+        worker["process"].join()
+        worker["connection"].close()
+
+    def suggest(self, words, timeout=None):
+        """
+        Retrieve the suggestions of words
+
+        Args:
+            words (list): list of unique words
+            timeout (float): time budget in seconds of each word from the time a worker takes it. By default (None), there is no time limit.
+
+        Raises:
+            RuntimeError: if a worker process fails to start
+
+        Returns:
+            tuple (dict, list): the suggestions of each word, and the list of the words which timed out whose suggestions are []
+        """
+        while len(self.workers) < min(self.size, len(words)):
+            self.workers.append(self.start_worker())
+        pending = list(reversed(words))
+        suggestions, timed_out = dict(), list()
+        while len(pending) or any(worker["word"] is not None for worker in self.workers):
+            for worker in self.workers:
+                if len(pending) and worker["ready"] and worker["word"] is None:
+                    worker["word"] = pending.pop()
+                    worker["deadline"] = None if timeout is None else time.monotonic() + timeout
+                    worker["connection"].send(worker["word"])
+
+            waiting = [worker for worker in self.workers if not worker["ready"] or worker["word"] is not None]
+            deadlines = [worker["deadline"] for worker in waiting if worker["deadline"] is not None]
+            wait_time = None if not len(deadlines) else max(min(deadlines) - time.monotonic(), 0)
+            ready_connections = multiprocessing.connection.wait([worker["connection"] for worker in waiting], wait_time)
+
+            for index, worker in enumerate(self.workers):
+                if worker["connection"] in ready_connections:
+                    try:
+                        message = worker["connection"].recv()
+                    except (EOFError, OSError):
+                        if not worker["ready"]:
+                            self.close()
+                            raise RuntimeError("A worker process of the suggestions failed to start.")
+                        # the worker died with its word, which is reported as timed out
+                        suggestions[worker["word"]] = []
+                        timed_out.append(worker["word"])
+                        self.stop_worker(worker)
+                        self.workers[index] = self.start_worker()
+                        continue
+                    if not worker["ready"]:
+                        worker["ready"] = True
+                    else:
+                        suggestions[worker["word"]] = message
+                        worker["word"], worker["deadline"] = None, None
+                elif worker["deadline"] is not None and worker["deadline"] <= time.monotonic():
+                    # a busy worker cannot be interrupted
+                    suggestions[worker["word"]] = []
+                    timed_out.append(worker["word"])
+                    self.stop_worker(worker)
+                    self.workers[index] = self.start_worker()
+                    self.replaced += 1
+        return suggestions, timed_out
+
+    def close(self):
+        """Stop the worker processes"""
+        for worker in self.workers:
+            try:
+                worker["connection"].send(None)
+            except OSError:
+                pass
+            worker["process"].join(1)
+            self.stop_worker(worker)
+        self.workers = list()
+
+class MorphologicalAnalysis:
+    """
+    A compact morphological analysis returned by `Stem.analyze` with `compact=True`
+
+    The fields are those of the dictionaries returned by `Stem.analyze` where `pos` and `lemma` are tuples. 
+    A field which is not provided by Hunspell is None, e.g. `formation` for inflectional forms. Use `to_dict()` to get the dictionary form.
+    The analyses are immutable as the cached ones are returned as such.
+
+    """
+    __slots__ = ("pos", "description", "stem", "lemma", "base", "prefixes", "suffixes", "formation")
+
+    def __init__(self, pos, description=None, stem=None, lemma=None, base=None, prefixes=None, suffixes=None, formation=None):
+        for field, value in zip(self.__slots__, (pos, description, stem, lemma, base, prefixes, suffixes, formation)):
+            object.__setattr__(self, field, value)
+
+    def __setattr__(self, field, value):
+        raise AttributeError("MorphologicalAnalysis is immutable.")
+
+    def __delattr__(self, field):
+        raise AttributeError("MorphologicalAnalysis is immutable.")
+
+    def __repr__(self):
+        return "MorphologicalAnalysis(%s)" % ", ".join("%s=%r" % (field, getattr(self, field)) for field in self.__slots__ if getattr(self, field) is not None)
+
+    def __eq__(self, other):
+        if not isinstance(other, MorphologicalAnalysis):
+            return NotImplemented
+        return all(getattr(self, field) == getattr(other, field) for field in self.__slots__)
+
+    def __hash__(self):
+        return hash(tuple(getattr(self, field) for field in self.__slots__))
+
+    def to_dict(self):
+        """The analysis as a dictionary as returned by `Stem.analyze` where the fields not provided by Hunspell are left out"""
+        analysis_dict = {"pos": list(self.pos)}
+        if self.description is not None:
+            analysis_dict["description"] = self.description
+        if self.stem is not None:
+            analysis_dict["stem"] = self.stem
+        analysis_dict["lemma"] = list(self.lemma)
+        if self.base is not None:
+            analysis_dict["base"], analysis_dict["prefixes"], analysis_dict["suffixes"] = self.base, self.prefixes, self.suffixes
+        if self.formation is not None:
+            analysis_dict["formation"] = self.formation
+        return analysis_dict
+
 class Stem:
     """
 
@@ -27,6 +381,19 @@ class Stem:
         - `stem`: stemming, e.g. "بڕاوە" → "بڕ"
         - `lemmatize`: lemmatization, e.g. "بردمنەوە" → "بردن"
 
+    Lists of words can be processed at once using `stem_many`, `analyze_many`, `lemmatize_many` and `check_many` where repeated words are processed once.
+    `correct_spelling_many` corrects a list of words in parallel worker processes with a time budget per word.
+    Words can be added to or removed from the dictionary at runtime using `add_word` and `remove_word`, and saved in a user dictionary loaded at startup using `Stem("Sorani", "Arabic", user_dictionary=path)`.
+    The word-forms of a lemma can be retrieved using `forms_of` with an index of word-forms, as in `Stem("Sorani", "Arabic", forms_index=path)`.
+    Hunspell suggestions can be replaced by a faster deletion index as in [SymSpell](https://github.com/wolfgarbe/SymSpell) using `Stem("Sorani", "Arabic", suggestion_index=path)`.
+
+    The results of these functions, except `correct_spelling`, can be cached by setting `cache_size` when a word-form is frequently repeated, as in `Stem("Sorani", "Arabic", cache_size=100000)`. 
+    Use `cache_info()` to get the statistics of the cache and `clear_cache()` when the dictionary of Hunspell is modified.
+
+    The Hunspell dictionary of each dialect and script is loaded once per process and shared by the instances. As a Hunspell handle is not thread-safe, 
+    an instance used by several threads can have its own pool of handles, as in `Stem("Sorani", "Arabic", pool_size=4)`. As the calls of Hunspell 
+    hold the GIL, the pool does not make them faster: use processes for throughput. It can be loaded in advance by `klpt.stem.preload("Sorani", "Arabic")` and released by `klpt.stem.unload("Sorani", "Arabic")`.
+
     It is recommended that this module be used on tokens using the tokenization module. 
     Please note that only Sorani is supported in this version in this module. The module is based on the [Kurdish Hunspell project](https://github.com/sinaahmadi/KurdishHunspell).
 
@@ -44,6 +411,8 @@ class Stem:
     (False, ['ستاندبووت', 'سووتاندبووت', 'سووڕاندبووت', 'ڕووتاندبووت', 'فەوتاندبووت', 'بووژاندبووت'])
     >>> stemmer.analyze("دیتبامن")
     [{'pos': ['verb'], 'description': 'past_stem_transitive_active', 'stem': 'دی', 'lemma': ['دیتن'], 'base': 'دیت', 'prefixes': '', 'suffixes': 'بامن'}]
+    >>> stemmer.analyze("دیتبامن", compact=True)
+    [MorphologicalAnalysis(pos=('verb',), description='past_stem_transitive_active', stem='دی', lemma=('دیتن',), base='دیت', prefixes='', suffixes='بامن')]
     >>> stemmer.stem("دەچینەوە")
     ['چ']
     >>> stemmer.stem("گورەکە", mark_unknown=True)
@@ -58,26 +427,185 @@ class Stem:
 
     """
     # to do: make the following function work for Kurmanji Latin also following the same algorithm
-    def __init__(self, dialect, script):
+    def __init__(self, dialect, script, cache_size=0, suggestion_index=None, suggestion_distance=2, pool_size=None, user_dictionary=None, forms_index=None, suggestion_workers=None):
+        """
+        Args:
+            dialect (str): the name of the dialect
+            script (str): the name of the script
+            cache_size (int): maximum number of words whose stems, lemmata, analyses and spell-checking results are cached. 
+                By default (0), nothing is cached. If set to None, the cache is unbounded.
+            suggestion_index (str): path of a deletion index (see `build_suggestion_index`) to be used instead of Hunspell for spelling suggestions. 
+                If the file does not exist, it is built from the words of the Hunspell dictionary. By default (None), Hunspell is used.
+            suggestion_distance (int): maximum edit distance of the suggestions of the deletion index
+            pool_size (int): if set, a `HunspellPool` of this number of Hunspell handles is used instead of the shared Hunspell handle 
+                so that the instance can be used by several threads at once. It does not run the calls in parallel (see `HunspellPool`). 
+                By default (None), the single shared handle is used. Use `pool_info()` to get its statistics.
+            user_dictionary (str): path of a file where the words added or removed by `add_word` and `remove_word` are saved. 
+                If the file exists, its changes are applied to the dictionary.
+            forms_index (str): path of the index of the word-forms of each lemma and stem used by `forms_of` (see `build_forms_index`). 
+                It is loaded on the first call of `forms_of` and should be built by `build_forms_index` beforehand.
+            suggestion_workers (int): maximum number of worker processes of `correct_spelling_many`. By default (None), the number of CPUs.
 
+        """
         self.dialect = dialect
         self.script = script 
 
         self.hunspell_flags = {"po": "pos", "is": "description", "ds": "formation", "st": "stem", "lem": "lemma"}
+        # characters removed by clean_stem except ":lf"
+        self.stem_flags = str.maketrans("", "", "VIT")
         
-        if self.dialect == "Sorani" and self.script == "Arabic":
-            self.huns = Hunspell("ckb-Arab", hunspell_data_dir=klpt.get_data("data/"))
-            with open(klpt.data_directory["morphemes"][self.dialect], "r", encoding = "utf-8") as f_morphemes:
-                self.light_verbs = json.load(f_morphemes)["Morphemes"]["light_verbs"][self.script]
-        elif self.dialect == "Kurmanji" and self.script == "Latin":
-            self.huns = Hunspell("kmr-Latn", hunspell_data_dir=klpt.get_data("data/"))
-            with open(klpt.data_directory["morphemes"][self.dialect], "r", encoding = "utf-8") as f_morphemes:
-                self.light_verbs = json.load(f_morphemes)["Morphemes"]["light_verbs"][self.script]
+        # the dictionary is shared by the instances of the same dialect and script. See `preload` and `unload`.
+        dictionary = preload(self.dialect, self.script)
+        self.hunspell_language = dictionary["language"]
+        if pool_size is None:
+            self.huns = dictionary["huns"]
+            self.dictionary = dictionary
         else:
-            raise Exception("Sorry, only Sorani dialect in the Arabic script and Kurmanji in the Latin script is supported now. Stay tuned for other dialects and scripts!")
-            
-        with open(klpt.data_directory["morphemes"][self.dialect], "r", encoding = "utf-8") as f_morphemes:
-            self.morphemes = json.load(f_morphemes)["Morphemes"]["Concatenated"][self.script]
+            # the handles of the pool have their own dictionary
+            self.huns = HunspellPool(self.hunspell_language, pool_size, klpt.get_data("data/"))
+            self.dictionary = dictionary_state()
+        self.dictionary["instances"].add(self)
+        self.light_verbs = dictionary["light_verbs"]
+        self.morphemes = dictionary["morphemes"]
+        self.prefix_trie, self.suffix_trie = dictionary["prefix_trie"], dictionary["suffix_trie"]
+
+        # results of stem, lemmatize, analyze and check_spelling keyed on (function, word). Use `cache_info()` to get the statistics of the cache.
+        self.cache = utility.LRUCache(cache_size)
+        # stems of the parts of the words which cannot be stemmed by Hunspell, including those without stems, used by the rule-based stemming
+        self.remainder_cache = utility.LRUCache()
+        # worker processes of correct_spelling_many, created on demand. The lock prevents them from being terminated by close() while in use.
+        self.suggestion_pool, self.suggestion_workers = None, suggestion_workers
+        self.suggestion_pool_lock = threading.RLock()
+
+        self.suggestion_distance = suggestion_distance
+        if suggestion_index is None:
+            self.deletion_index = None
+        else:
+            if not os.path.exists(suggestion_index):
+                self.build_suggestion_index(suggestion_index, max_distance=suggestion_distance)
+            self.deletion_index = utility.DeletionIndex(suggestion_index)
+
+        self.forms_index_path, self.forms_index = forms_index, None
+
+        self.user_dictionary = user_dictionary
+        if user_dictionary is not None:
+            self.load_user_dictionary(user_dictionary)
+
+    def cache_info(self):
+        """Statistics of the cache of stems, lemmata, analyses and spell-checking results
+
+        Returns:
+            dict: number of hits, misses and evictions, and the current and maximum size of the cache
+        """
+        return self.cache.info()
+
+    def pool_info(self):
+        """Statistics of the pool of Hunspell handles (see `HunspellPool.info`), None if the instance does not use a pool"""
+        return self.huns.info() if isinstance(self.huns, HunspellPool) else None
+
+    def clear_cache(self):
+        """Remove all the cached results, e.g. when the dictionary of Hunspell is modified"""
+        self.cache.clear()
+        self.remainder_cache.clear()
+
+    def load_user_dictionary(self, path):
+        """
+        Apply the changes saved in a user dictionary by `add_word` and `remove_word` to the dictionary, unless the user dictionary 
+        has already been applied to it, e.g. by another instance sharing the dictionary.
+
+        Args:
+            path (str): path of the user dictionary
+        """
+        with self.dictionary["lock"]:
+            if os.path.abspath(path) in self.dictionary["user_dictionaries"]:
+                return
+            # the later changes of the file are applied when they are made
+            self.dictionary["user_dictionaries"].add(os.path.abspath(path))
+            if not os.path.exists(path):
+                return
+            changed = False
+            with open(path, "r", encoding = "utf-8") as f_user_dictionary:
+                for line in f_user_dictionary:
+                    change = line.rstrip("\n").split("\t")
+                    if change[0] in ["add", "remove"]:
+                        changed = self.change_dictionary(change) or changed
+            if changed:
+                self.update_dictionary(None, persist=False)
+
+    def add_word(self, word, example=None, persist=True):
+        """
+        Add a word to the Hunspell dictionary at runtime. If an example word of the dictionary is given, the word is inflected as the example, 
+        e.g. `add_word("kompîtur", example="mal")` so that "kompîturên" is also correct. 
+        
+        The dictionary is shared by all the instances of the same dialect and script, except those with a pool of Hunspell handles, 
+        and their cached results are cleared. The deletion index of `suggestion_index` is not modified.
+
+        Args:
+            word (str): the new word
+            example (str): a word of the dictionary whose affixes are allowed for the new word
+            persist (bool): if True, the change is saved in the user dictionary, if any
+
+        Returns:
+            bool: True if the word is added, False if not, e.g. if the example does not exist in the dictionary. The change is only saved if the word is added.
+        """
+        change = ["add", word] + ([example] if example is not None else [])
+        if not self.change_dictionary(change):
+            return False
+        self.update_dictionary(change, persist)
+        return True
+
+    def remove_word(self, word, persist=True):
+        """
+        Remove a word from the Hunspell dictionary at runtime. As in `add_word`, the dictionary is shared by the instances of the same dialect and script.
+        Hunspell marks the word as forbidden, which is not effective in all the versions of Hunspell. Therefore, the removed word is also kept 
+        in a set of removed words so that it is neither correct nor stemmed or analyzed by the functions of this class.
+
+        Args:
+            word (str): the word to be removed
+            persist (bool): if True, the change is saved in the user dictionary, if any
+
+        Returns:
+            bool: True if the word is removed
+        """
+        self.change_dictionary(["remove", word])
+        self.update_dictionary(["remove", word], persist)
+        return True
+
+    def change_dictionary(self, change):
+        """Apply a change to Hunspell and record it in the state of the dictionary (see `dictionary_state`)
+
+        Args:
+            change (list): "add" and the word with its example, if any, or "remove" and the word
+
+        Returns:
+            bool: True if the change is applied, False if Hunspell failed to add the word
+        """
+        with self.dictionary["lock"]:
+            if change[0] == "add":
+                status = self.huns.add(change[1]) if len(change) < 3 else self.huns.add_with_affix(change[1], change[2])
+                if status != 0:
+                    return False
+                self.dictionary["removed_words"].discard(change[1])
+            else:
+                self.huns.remove(change[1])
+                self.dictionary["removed_words"].add(change[1])
+            self.dictionary["changes"].append(change)
+            return True
+
+    def update_dictionary(self, change, persist):
+        """Clear the cached results of the instances sharing the dictionary once modified and save the change in the user dictionary if persist is True
+
+        Args:
+            change (list): "add" and the word with its example, if any, or "remove" and the word. None if there is nothing to save.
+            persist (bool): save the change in the user dictionary, if any
+        """
+        for instance in list(self.dictionary["instances"]):
+            instance.clear_cache()
+            # the worker processes have a copy of the dictionary before the change
+            instance.close()
+        if change is not None and persist and self.user_dictionary is not None:
+            with open(self.user_dictionary, "a", encoding = "utf-8") as f_user_dictionary:
+                f_user_dictionary.write("\t".join(change) + "\n")
 
     def stem(self, word, mark_unknown=False):
         """A function for stemming a single word
@@ -95,54 +623,100 @@ class Stem:
         if not isinstance(word, str):
             raise TypeError("Not supported yet.")
         elif (self.dialect == "Sorani" and self.script == "Arabic") or (self.dialect == "Kurmanji" and self.script == "Latin"):
-            stems = list(set([self.clean_stem(i) for i in self.huns.stem(word)]))
-            if len(stems):
-                return stems
+            if self.cache.maxsize == 0:
+                return self.stem_word(word, mark_unknown)
+            stems = self.cache.get(("stem", word, mark_unknown))
+            if stems is None:
+                stems = tuple(self.stem_word(word, mark_unknown))
+                self.cache.put(("stem", word, mark_unknown), stems)
+            return list(stems)
+
+    def stem_word(self, word, mark_unknown=False, hunspell_stems=None):
+        """Stem a single word with Hunspell and the morphological rules without using the cache
+
+        Args:
+            word (str): input word
+            mark_unknown (False): mark the stems found by the rules with "_"
+            hunspell_stems (list): stems of the word already retrieved from Hunspell, e.g. in bulk. If None, Hunspell is called.
+
+        Returns:
+            list: list of stem(s)
+        """
+        stems = list(set([self.clean_stem(i) for i in (self.hunspell("stem", word) if hunspell_stems is None else hunspell_stems)]))
+        if len(stems):
+            return stems
+
+        # not detected by Hunspell or the word doesn't exist in the tagged lexicon
+        # the candidate remainders of each step are stemmed at once by `stem_remainders`
+        remainders = list()
+        for verb in self.light_verbs:
+            if word.endswith(verb) and len(word.rpartition(verb)[0]):
+                # the word is a compound form with a light verb. Try stemming the other part by Hunspell
+                word = word.rpartition(verb)[0].strip()
+                remainders.append(word)
+        remainder_stems = self.stem_remainders(remainders)
+        for remainder in remainders:
+            if len(remainder_stems[remainder]):
+                # the word is a compound form with a light verb. The other part can be stemmed by Hunspell
+                return list(remainder_stems[remainder])
+        
+        # the other part of the word or the whole word cannot be stemmed by Hunspell
+        # so, find the stem following morphological rules by checking if removing possible prefixes and suffixes would help finding the stem.
+        # Note: even though the same morphemes used in the tokenization system are used in the rules here, there is a delicate difference.
+        #    In the tokenization system, the trimming is done in such a way that shorter morphemes are first checked for suffixes (suffixes in the json file is sorted by length) and longer prefixes are trimmed first.
+        #    For the stemmer, however, we do differently by first checking the longer morphemes then shorter ones (for both prefixes and suffixes). 
+        #    This is due to the different purposes of the two tasks. Therefore, the list of the morphemes is to be reversed for suffixes (not prefixes). 
+        # In order not to modify the json files, the suffix trie is built on the reversed list of suffixes.
+        
+        remainders = [word[len(preposition):] for preposition in utility.match_affixes(word, self.prefix_trie)]
+        remainder_stems = self.stem_remainders(remainders)
+        for remainder in remainders:
+            if len(remainder_stems[remainder]):
+                if mark_unknown:
+                    return ["_" + i + "_" for i in remainder_stems[remainder]]
             else:
-                # not detected by Hunspell or the word doesn't exist in the tagged lexicon
-                for verb in self.light_verbs:
-                    if word.endswith(verb) and len(word.rpartition(verb)[0]):
-                        stems = list(set([self.clean_stem(i) for i in self.huns.stem(word.rpartition(verb)[0].strip())]))
-                        if len(stems):
-                            # the word is a compound form with a light verb. The other part can be stemmed by Hunspell
-                            return stems
-                        else:
-                            # the word is a compound form with a light verb but the other part cannot be stemmed by Hunspell
-                            word = word.rpartition(verb)[0].strip()
-                
-                # the other part of the word or the whole word cannot be stemmed by Hunspell
-                # so, find the stem following morphological rules by checking if removing possible prefixes and suffixes would help finding the stem.
-                # Note: even though the same morphemes used in the tokenization system are used in the rules here, there is a delicate difference.
-                #    In the tokenization system, the trimming is done in such a way that shorter morphemes are first checked for suffixes (suffixes in the json file is sorted by length) and longer prefixes are trimmed first.
-                #    For the stemmer, however, we do differently by first checking the longer morphemes then shorter ones (for both prefixes and suffixes). 
-                #    This is due to the different purposes of the two tasks. Therefore, the list of the morphemes is to be reversed for suffixes (not prefixes). 
-                # In order not to modify the json files, the `reversed` function is used for suffixes.
-                
-                for preposition in self.morphemes["prefixes"]:
-                    if word.startswith(preposition) and len(word.split(preposition, 1)) > 1:
-                        if len(list(set([self.clean_stem(i) for i in self.huns.stem(word.split(preposition, 1)[1])]))):
-                            stems = list(set([self.clean_stem(i) for i in self.huns.stem(word.split(preposition, 1)[1])]))
-                            if mark_unknown:
-                                return ["_" + i + "_" for i in stems]
-                        else:
-                            word = word.split(preposition, 1)[1]
-                            break
-                
-                for postposition in reversed(list(self.morphemes["suffixes"])):
-                    if word.endswith(postposition) and len(word.rpartition(postposition)[0]):
-                        if len(list(set([self.clean_stem(i) for i in self.huns.stem(word.rpartition(postposition)[0])]))):
-                            stems = list(set([self.clean_stem(i) for i in self.huns.stem(word.rpartition(postposition)[0])]))
-                            if mark_unknown:
-                                return ["_" + i + "_" for i in stems]
-                        else:
-                            word = word.rpartition(postposition)[0]
-                            break
-                
-                # not possible to stem the word using the tagged lexicon or the rule-based approach. Return the word as it is.
+                word = remainder
+                break
+        
+        remainders = [word[:-len(postposition)] for postposition in utility.match_affixes(word, self.suffix_trie, reverse=True) if len(postposition) < len(word)]
+        remainder_stems = self.stem_remainders(remainders)
+        for remainder in remainders:
+            if len(remainder_stems[remainder]):
                 if mark_unknown:
-                    return ["_" + word + "_"]
-                else:
-                    return [word]
+                    return ["_" + i + "_" for i in remainder_stems[remainder]]
+            else:
+                word = remainder
+                break
+        
+        # not possible to stem the word using the tagged lexicon or the rule-based approach. Return the word as it is.
+        if mark_unknown:
+            return ["_" + word + "_"]
+        else:
+            return [word]
+
+    def stem_remainders(self, remainders):
+        """Stem the remainders of a word after removing a light verb or an affix by Hunspell in bulk. 
+        The stems are cached including empty ones, i.e. the remainders which cannot be stemmed.
+
+        Args:
+            remainders (list): list of remainders
+
+        Returns:
+            dict: the stems of each remainder as a tuple, empty if the remainder cannot be stemmed
+        """
+        remainder_stems, missing_remainders = dict(), list()
+        for remainder in dict.fromkeys(remainders):
+            stems = self.remainder_cache.get(remainder)
+            if stems is None:
+                missing_remainders.append(remainder)
+            else:
+                remainder_stems[remainder] = stems
+
+        if len(missing_remainders):
+            for remainder, hunspell_stems in self.hunspell_many("stem", missing_remainders).items():
+                remainder_stems[remainder] = tuple(set([self.clean_stem(i) for i in hunspell_stems]))
+                self.remainder_cache.put(remainder, remainder_stems[remainder])
+        return remainder_stems
 
     def lemmatize(self, word):
         """A function for lemmatization of words
@@ -159,8 +733,12 @@ class Stem:
         if not isinstance(word, str):
             raise TypeError("Not supported yet.")
         elif (self.dialect == "Sorani" and self.script == "Arabic") or (self.dialect == "Kurmanji" and self.script == "Latin"):
-            word_analysis = self.analyze(word)
-            return list(set([item for sublist in word_analysis for item in sublist["lemma"] if item != '']))
+            lemmata = self.cache.get(("lemmatize", word)) if self.cache.maxsize != 0 else None
+            if lemmata is None:
+                word_analysis = self.analyze(word, compact=True)
+                lemmata = tuple(set([item for analysis in word_analysis for item in analysis.lemma if item not in ['', None]]))
+                self.cache.put(("lemmatize", word), lemmata)
+            return list(lemmata)
 
     def clean_stem(self, word):
         """Remove extra characters in the stem
@@ -171,9 +749,7 @@ class Stem:
         Args:
             word ([str]): [stem]
         """
-        for char in ["V", "I", "T"]:
-            word = word.replace(char, "")
-        return word.replace(":lf", "")
+        return word.translate(self.stem_flags).replace(":lf", "")
 
     def check_spelling(self, word):
         """Check spelling of a word
@@ -190,9 +766,15 @@ class Stem:
         if not isinstance(word, str):
             raise TypeError("Not supported yet.")
         elif (self.dialect == "Sorani" and self.script == "Arabic") or (self.dialect == "Kurmanji" and self.script == "Latin"):
-            return self.huns.spell(word)
+            if self.cache.maxsize == 0:
+                return self.hunspell("spell", word)
+            is_correct = self.cache.get(("check_spelling", word))
+            if is_correct is None:
+                is_correct = self.hunspell("spell", word)
+                self.cache.put(("check_spelling", word), is_correct)
+            return is_correct
 
-    def correct_spelling(self, word):
+    def correct_spelling(self, word, max_suggestions=None):
         """
         Correct spelling errors if the input word is incorrect. It returns a tuple where the first element indicates the correctness of the word (True if correct, False if incorrect).
             If the input word is incorrect, suggestions are provided in a list as the second element of the tuple, as (False, []).
@@ -200,6 +782,7 @@ class Stem:
 
         Args:
             word (str): input word to be spell-checked
+            max_suggestions (int): maximum number of suggestions. By default, all the suggestions of Hunspell are returned.
 
         Raises:
             TypeError: only string as input
@@ -213,9 +796,120 @@ class Stem:
         elif (self.dialect == "Sorani" and self.script == "Arabic") or (self.dialect == "Kurmanji" and self.script == "Latin"):
             if self.check_spelling(word):
                 return (True, [])
-            return (False, list(self.huns.suggest(word)))
+            if self.deletion_index is not None:
+                return (False, self.deletion_index.lookup(word, self.suggestion_distance, max_suggestions))
+            return (False, self.hunspell("suggest", word)[:max_suggestions])
+
+    def dictionary_words(self):
+        """The words of the Hunspell dictionary file without their flags and morphological fields
+
+        Returns:
+            list: the words in the order of the dictionary file
+        """
+        words = list()
+        with open(klpt.get_data("data/%s.dic" % self.hunspell_language), "r", encoding = "utf-8") as f_dic:
+            # the first line is the number of words
+            for line in list(f_dic)[1:]:
+                word = line.split()[0].split("/")[0] if len(line.split()) else ""
+                if len(word):
+                    words.append(word)
+        return words
+
+    def dictionary_forms(self):
+        """The word-forms of the Hunspell dictionary, i.e. its words and the forms generated by the affix rules allowed by their flags (see `utility.expand_affixes`)
+
+        Returns:
+            generator: the word-forms of each word of the dictionary file in its order. A word-form generated from several words is repeated.
+        """
+        rules = utility.read_affix_rules(klpt.get_data("data/%s.aff" % self.hunspell_language))
+        with open(klpt.get_data("data/%s.dic" % self.hunspell_language), "r", encoding = "utf-8") as f_dic:
+            # the first line is the number of words
+            next(f_dic, None)
+            for line in f_dic:
+                if not len(line.split()):
+                    continue
+                word, _, flags = line.split()[0].partition("/")
+                yield from sorted(utility.expand_affixes(word, flags, rules))
+
+    def build_suggestion_index(self, path, words=None, validate=True, max_distance=2):
+        """
+        Build a deletion index of the words of the Hunspell dictionary for fast spelling suggestions as in [SymSpell](https://github.com/wolfgarbe/SymSpell). 
+        The index is saved in a file which is memory-mapped when used by `Stem(..., suggestion_index=path)`.
+
+        Args:
+            path (str): path of the index file
+            words (iterable or dict): additional words, e.g. word-forms of a corpus, or a dictionary of words and their frequencies. 
+                The frequent words are suggested first. The frequency of the words of the Hunspell dictionary is 1.
+            validate (bool): if True, only the additional words which are correct according to Hunspell are added
+            max_distance (int): maximum edit distance of the suggestions
+        """
+        frequencies = {word: 1 for word in self.dictionary_words()}
+
+        if words is not None:
+            # the words are read twice to be validated, which a generator does not allow
+            words = words if isinstance(words, dict) else list(words)
+            if validate:
+                words = {word: words[word] if isinstance(words, dict) else 1 for word, is_correct in zip(words, self.check_many(words)) if is_correct}
+            for word in words:
+                frequencies[word] = frequencies.get(word, 0) + (words[word] if isinstance(words, dict) else 1)
+
+        utility.build_deletion_index(frequencies, path, max_distance=max_distance)
+
+    def correct_spelling_many(self, words, timeout=None, max_suggestions=None):
+        """
+        Correct spelling errors of a list of words within a time budget per word. 
+        
+        The suggestions of the incorrect words are retrieved in parallel by a `SuggestionPool` of worker processes so that a word whose suggestions take long 
+        does not block the other words. The time budget of a word starts when a worker takes it: the suggestions of a word which are not ready 
+        after `timeout` seconds are given up, the word is reported as timed out and its worker is replaced. 
+        The pool is sized once by `suggestion_workers` and its worker processes are kept for the next calls. Use `close()` to terminate them.
+        If the worker processes are not forked, e.g. on macOS and Windows, they load the dictionary and apply the changes of `add_word` and `remove_word` again.
+
+        Args:
+            words (list): list of words
+            timeout (float): time budget in seconds of the suggestions of each word. By default (None), there is no time limit.
+            max_suggestions (int): maximum number of suggestions of each word. By default, all the suggestions of Hunspell are returned.
+
+        Raises:
+            TypeError: only a list of strings as input
 
-    def analyze(self, word_form):
+        Returns:
+            tuple (list, list): the output of `correct_spelling` for each word in the same order as the input, and the list of the words which timed out. 
+                (False, []) is returned for the words which timed out.
+        """
+        words = list(words)
+        unique_words = list(dict.fromkeys(words))
+        is_correct = dict(zip(unique_words, self.check_many(unique_words)))
+        incorrect_words = [word for word in is_correct if not is_correct[word]]
+        suggestions, timed_out = dict(), list()
+
+        if self.deletion_index is not None:
+            # the suggestions of the deletion index are fast enough not to need workers
+            for word in incorrect_words:
+                suggestions[word] = self.deletion_index.lookup(word, self.suggestion_distance, max_suggestions)
+        elif len(incorrect_words):
+            with self.suggestion_pool_lock:
+                if self.suggestion_pool is None:
+                    changes = list(self.dictionary["changes"])
+                    if multiprocessing.get_start_method() == "fork":
+                        initargs = (self.huns, None, None, changes)
+                    else:
+                        initargs = (None, self.hunspell_language, klpt.get_data("data/"), changes)
+                    self.suggestion_pool = SuggestionPool(self.suggestion_workers or os.cpu_count() or 1, initargs)
+                word_suggestions, timed_out = self.suggestion_pool.suggest(incorrect_words, timeout)
+            for word in incorrect_words:
+                suggestions[word] = word_suggestions[word][:max_suggestions]
+
+        return [(True, []) if is_correct[word] else (False, suggestions[word]) for word in words], timed_out
+
+    def close(self):
+        """Terminate the worker processes of `correct_spelling_many`, once the current call, if any, is done"""
+        with self.suggestion_pool_lock:
+            if self.suggestion_pool is not None:
+                self.suggestion_pool.close()
+            self.suggestion_pool = None
+
+    def analyze(self, word_form, compact=False):
         """
         Morphological analysis of a given word.
         
@@ -240,6 +934,7 @@ class Stem:
 
         Args:
             word_form (str): a single word-form
+            compact (bool): if True, the analyses are returned as `MorphologicalAnalysis` objects instead of dictionaries
 
         Raises:
             TypeError: only string as input
@@ -250,53 +945,266 @@ class Stem:
         """
         if not isinstance(word_form, str):
             raise TypeError("Only a word (str) is allowed.")
+        elif self.cache.maxsize == 0:
+            word_analysis = self.analyze_word(word_form)
         else:
-            word_analysis = list()
-            # Given the morphological analysis of a word-form with Hunspell flags, extract relevant information and return a dictionary
-            # print(self.huns.analyze(word_form))
-            for analysis in list(self.huns.analyze(word_form)):
-                analysis_dict = dict()
-                for item in analysis.split():
-                    if ":" not in item:
-                        continue
-                    if item.split(":")[1] == "ts":
-                        # ts flag exceptionally appears after the value as value:key in the Hunspell output
-                        # anything except the terminal_suffix (ts) is considered to be the base
-                        analysis_dict["base"] = item.split(":")[0]
-                        affixes = utility.extract_prefix_suffix(word_form, item.split(":")[0])
-                        analysis_dict["prefixes"] = affixes[0]
-                        analysis_dict["suffixes"] = affixes[2]
-                        
-                    elif item.split(":")[0] in self.hunspell_flags.keys():
-                        # assign the key:value pairs from the Hunspell string output to the dictionary output of the current function
-                        if item.split(":")[0] == "ds":
-                            # for ds flag, add derivation as the formation type, otherwise inflection
-                            analysis_dict[self.hunspell_flags[item.split(":")[0]]] = "derivational"
-                            analysis_dict[self.hunspell_flags["is"]] = item.split(":")[1]
-
-                        elif item.split(":")[0] == "st":
-                            # for st flag, stem should be cleaned first
-                            analysis_dict[self.hunspell_flags[item.split(":")[0]]] = self.clean_stem(item.split(":")[1])
-
-                        else:
-                            # remove I, T or V using clean_stem()
-                            analysis_dict[self.hunspell_flags[item.split(":")[0]]] = self.clean_stem(item.split(":")[1])
-                            
-                # convert lemma and pos to a list and split based on _ when there is more than one output, e.g. more than one lemma for a given word
-                if "lemma" in analysis_dict:
-                    analysis_dict["lemma"] = analysis_dict["lemma"].split("_")
-                else:
-                    analysis_dict["lemma"] = [""]
-                
-                if "pos" in analysis_dict:
-                    analysis_dict["pos"] = analysis_dict["pos"].split("_")
-                else:
-                    analysis_dict["pos"] = [""]
-                
-                # for nouns, base is lemma
-                if len(analysis_dict["pos"]) and analysis_dict["pos"] != ["verb"]:
-                    analysis_dict["lemma"] = [analysis_dict["base"]]
-
-                word_analysis.append(analysis_dict)
-
-        return word_analysis
\ No newline at end of file
+            word_analysis = self.cache.get(("analyze", word_form))
+            if word_analysis is None:
+                word_analysis = tuple(self.analyze_word(word_form))
+                self.cache.put(("analyze", word_form), word_analysis)
+        return list(word_analysis) if compact else [analysis.to_dict() for analysis in word_analysis]
+
+    def analyze_word(self, word_form, hunspell_analyses=None):
+        """Morphological analysis of a single word-form with Hunspell without using the cache
+
+        Args:
+            word_form (str): a single word-form
+            hunspell_analyses (list): analyses of the word-form already retrieved from Hunspell, e.g. in bulk. If None, Hunspell is called.
+
+        Returns:
+            (list(MorphologicalAnalysis)): a list of all possible morphological analyses as described in `analyze`
+        """
+        return [self.parse_analysis(word_form, analysis) for analysis in (self.hunspell("analyze", word_form) if hunspell_analyses is None else hunspell_analyses)]
+
+    def parse_analysis(self, word_form, analysis):
+        """Given the morphological analysis of a word-form with Hunspell flags, extract relevant information as described in `analyze`
+
+        Args:
+            word_form (str): a single word-form
+            analysis (str): an analysis of the word-form by Hunspell, e.g. "po:verb is:past_stem_transitive_active st:دی lem:دیتن دیت:ts بامن"
+
+        Returns:
+            MorphologicalAnalysis: the analysis
+        """
+        pos, description, stem, lemma, base, prefixes, suffixes, formation = None, None, None, None, None, None, None, None
+        for item in analysis.split():
+            if ":" not in item:
+                continue
+            fields = item.split(":")
+            flag, value = fields[0], fields[1]
+            if value == "ts":
+                # ts flag exceptionally appears after the value as value:key in the Hunspell output
+                # anything except the terminal_suffix (ts) is considered to be the base
+                base = flag
+                prefixes, _, suffixes = utility.extract_prefix_suffix(word_form, base)
+            elif flag == "ds":
+                # for ds flag, add derivation as the formation type, otherwise inflection
+                formation, description = "derivational", value
+            elif flag == "po":
+                # remove I, T or V as in clean_stem(). The value cannot contain ":lf" as it is split by ":".
+                pos = value.translate(self.stem_flags)
+            elif flag == "is":
+                description = value.translate(self.stem_flags)
+            elif flag == "st":
+                stem = value.translate(self.stem_flags)
+            elif flag == "lem":
+                lemma = value.translate(self.stem_flags)
+
+        # convert lemma and pos to a tuple and split based on _ when there is more than one output, e.g. more than one lemma for a given word
+        lemma = tuple(lemma.split("_")) if lemma is not None else ("",)
+        pos = tuple(pos.split("_")) if pos is not None else ("",)
+        # for nouns, base is lemma
+        if pos != ("verb",):
+            lemma = (base,)
+
+        return MorphologicalAnalysis(pos, description, stem, lemma, base, prefixes, suffixes, formation)
+
+    def hunspell(self, action, word):
+        """Call a function of Hunspell on a word where the words removed by `remove_word` are incorrect and have no stems, analyses or suggestions
+
+        Args:
+            action (str): the name of the function, i.e. "stem", "analyze", "spell" or "suggest"
+            word (str): a word
+
+        Returns:
+            the output of Hunspell
+        """
+        removed_words = self.dictionary["removed_words"]
+        if word in removed_words:
+            return False if action == "spell" else []
+        output = getattr(self.huns, action)(word)
+        if action == "suggest":
+            return [suggestion for suggestion in output if suggestion not in removed_words]
+        return output
+
+    def hunspell_many(self, action, words):
+        """Call a function of Hunspell on a list of unique words
+
+        The bulk functions of Hunspell, e.g. `bulk_stem` and `bulk_analyze` of cyhunspell, are used if available. Otherwise, the function is called on each word.
+
+        Args:
+            action (str): the name of the function, i.e. "stem", "analyze" or "spell"
+            words (list): list of unique words
+
+        Returns:
+            dict: the output of Hunspell for each word as in `hunspell`
+        """
+        if not hasattr(self.huns, "bulk_" + action):
+            return {word: self.hunspell(action, word) for word in words}
+        removed_words = self.dictionary["removed_words"]
+        output = getattr(self.huns, "bulk_" + action)([word for word in words if word not in removed_words])
+        for word in words:
+            if word in removed_words:
+                output[word] = False if action == "spell" else []
+        return output
+
+    def process_many(self, key, words, process):
+        """Process the unique words of a list with the cache
+
+        Args:
+            key (tuple): the name of the function and its parameters. The cache key of a word is (key[0], word) + key[1:].
+            words (list): list of words
+            process (function): given a list of unique words missing in the cache, return a dictionary of their results
+
+        Raises:
+            TypeError: only a list of strings as input
+
+        Returns:
+            dict: the result of each unique word
+        """
+        results, missing_words = dict(), list()
+        for word in dict.fromkeys(words):
+            if not isinstance(word, str):
+                raise TypeError("Only a list of words (str) is allowed.")
+            result = self.cache.get((key[0], word) + key[1:]) if self.cache.maxsize != 0 else None
+            if result is None:
+                missing_words.append(word)
+            else:
+                results[word] = result
+
+        if len(missing_words):
+            for word, result in process(missing_words).items():
+                self.cache.put((key[0], word) + key[1:], result)
+                results[word] = result
+        return results
+
+    def stem_many(self, words, mark_unknown=False):
+        """Stem a list of words. Repeated words are stemmed once and Hunspell is called in bulk if possible.
+
+        Args:
+            words (list): list of words
+            mark_unknown (False): mark the stems found by the rules with "_" as in `stem`
+
+        Raises:
+            TypeError: only a list of strings as input
+
+        Returns:
+            list: list of stem(s) of each word, in the same order as the input
+        """
+        words = list(words)
+
+        def process(missing_words):
+            hunspell_stems = self.hunspell_many("stem", missing_words)
+            return {word: tuple(self.stem_word(word, mark_unknown, hunspell_stems[word])) for word in missing_words}
+
+        results = self.process_many(("stem", mark_unknown), words, process)
+        return [list(results[word]) for word in words]
+
+    def analyze_many(self, word_forms, compact=False):
+        """Morphological analysis of a list of word-forms. Repeated word-forms are analyzed once and Hunspell is called in bulk if possible.
+
+        Args:
+            word_forms (list): list of word-forms
+            compact (bool): if True, the analyses are returned as `MorphologicalAnalysis` objects instead of dictionaries
+
+        Raises:
+            TypeError: only a list of strings as input
+
+        Returns:
+            list: list of analyses of each word-form as in `analyze`, in the same order as the input
+        """
+        word_forms = list(word_forms)
+
+        def process(missing_words):
+            hunspell_analyses = self.hunspell_many("analyze", missing_words)
+            return {word: tuple(self.analyze_word(word, hunspell_analyses[word])) for word in missing_words}
+
+        results = self.process_many(("analyze",), word_forms, process)
+        if compact:
+            return [list(results[word]) for word in word_forms]
+        return [[analysis.to_dict() for analysis in results[word]] for word in word_forms]
+
+    def lemmatize_many(self, words):
+        """Lemmatize a list of words. Repeated words are lemmatized once and Hunspell is called in bulk if possible.
+
+        Args:
+            words (list): list of words
+
+        Raises:
+            TypeError: only a list of strings as input
+
+        Returns:
+            list: list of lemma(s) of each word, in the same order as the input
+        """
+        words = list(words)
+
+        def process(missing_words):
+            return {word: tuple(set([item for analysis in word_analysis for item in analysis.lemma if item not in ['', None]]))
+                    for word, word_analysis in zip(missing_words, self.analyze_many(missing_words, compact=True))}
+
+        results = self.process_many(("lemmatize",), words, process)
+        return [list(results[word]) for word in words]
+
+    def check_many(self, words):
+        """Check spelling of a list of words. Repeated words are checked once.
+
+        Args:
+            words (list): list of words
+
+        Raises:
+            TypeError: only a list of strings as input
+
+        Returns:
+            list: True or False for each word, in the same order as the input
+        """
+        words = list(words)
+        results = self.process_many(("check_spelling",), words, lambda missing_words: self.hunspell_many("spell", missing_words))
+        return [results[word] for word in words]
+
+    def build_forms_index(self, path, words=None):
+        """
+        Build an index of the word-forms of each lemma and stem, the reverse of `lemmatize` and `stem`, and save it to be used by `forms_of`.
+        The word-forms are analyzed by `analyze` and indexed by their lemmata and stems. The forms which cannot be analyzed are left out.
+
+        By default, the word-forms generated from the Hunspell dictionary by `dictionary_forms` are indexed, e.g. "malan" and "malê" for "mal". 
+        They are about 750,000 for Kurmanji, which takes less than a minute, and about 16 million for Sorani, which takes about a quarter of an hour: 
+        the vocabulary of a corpus is then a faster alternative. The word-forms are analyzed in batches and their (lemma, word-form) pairs 
+        are sorted in temporary files next to the index file (see `utility.build_inverted_index_from_pairs`), so that the memory used is bounded.
+
+        Args:
+            path (str): path of the index file
+            words (iterable): word-forms to be indexed, e.g. the vocabulary of a corpus. By default, the word-forms of the Hunspell dictionary.
+        """
+        words = iter(self.dictionary_forms() if words is None else words)
+
+        def form_pairs():
+            batch = list(itertools.islice(words, 10000))
+            while len(batch):
+                for word, word_analysis in zip(batch, self.analyze_many(batch, compact=True)):
+                    for analysis in word_analysis:
+                        for key in set(analysis.lemma) | {analysis.stem}:
+                            if key:
+                                yield key, word
+                batch = list(itertools.islice(words, 10000))
+        utility.build_inverted_index_from_pairs(form_pairs(), path)
+
+    def forms_of(self, lemma):
+        """
+        Word-forms of a lemma or a stem, e.g. for query expansion, using the index given as `forms_index` to the constructor
+
+        Args:
+            lemma (str): a lemma or a stem
+
+        Raises:
+            ValueError: if no forms index is given or it is not built yet
+
+        Returns:
+            list: the sorted word-forms of the index whose lemma or stem is the given one
+        """
+        if self.forms_index is None:
+            if self.forms_index_path is None:
+                raise ValueError("No forms index is given. Use Stem(..., forms_index=path).")
+            if not os.path.exists(self.forms_index_path):
+                raise ValueError("The forms index %s does not exist. Build it first with build_forms_index()." % self.forms_index_path)
+            self.forms_index = utility.InvertedIndex(self.forms_index_path)
+        return self.forms_index.get(lemma, [])
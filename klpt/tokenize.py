@@ -17,6 +17,38 @@ sys.path.append('../klpt')
 from klpt.configuration import Configuration
 from klpt.preprocess import Preprocess
 import klpt
+from klpt import utility
+
+# single characters used by the sentence tokenizer to mark periods which are not a sentence boundary, sentence boundaries and removed periods.
+# Unlike <prd> and <stop> markers, they keep the offsets of the text.
+PERIOD_MARK, BOUNDARY_MARK, REMOVED_MARK = "\ufdd0", "\ufdd1", "\ufdd2"
+
+class Token:
+    """
+    A token returned by `Tokenize.word_spans`
+
+    - `text`: the token as segmented by the lexicon and the morpheme files. For multi-word expressions, the form appearing in the input.
+    - `start`, `end`: character offsets of the token in the input, i.e. `sentence[start:end]`
+    - `kind`: one of "word" (found in the lexicon), "mwe" (multi-word expression), "prefix", "suffix" or "unknown"
+    - `lemma`: the lemma of a multi-word expression where the parts are delimited by a dash (-), otherwise None
+
+    """
+    __slots__ = ("text", "start", "end", "kind", "lemma")
+
+    def __init__(self, text, start, end, kind, lemma=None):
+        self.text = text
+        self.start = start
+        self.end = end
+        self.kind = kind
+        self.lemma = lemma
+
+    def __repr__(self):
+        return "Token(%r, %d, %d, %r, %r)" % (self.text, self.start, self.end, self.kind, self.lemma)
+
+    def __eq__(self, other):
+        if not isinstance(other, Token):
+            return NotImplemented
+        return (self.text, self.start, self.end, self.kind, self.lemma) == (other.text, other.start, other.end, other.kind, other.lemma)
 
 class Tokenize:
     """
@@ -26,6 +58,9 @@ class Tokenize:
     - `word_tokenize`: tokenization of texts into tokens (both [multi-word expressions](https://aclweb.org/aclwiki/Multiword_Expressions) and single-word tokens).
     - `mwe_tokenize`: tokenization of texts by only taking compound forms into account
     - `sent_tokenize`: tokenization of texts into sentences
+    - `word_spans`: tokenization of texts into `Token` objects with their character offsets in the input
+    - `sent_spans`: tokenization of texts into sentences with their character offsets in the input
+    - `sent_tokenize_stream`: tokenization of file objects and streams of text into sentences
 
     The module is based on the [Kurdish tokenization project](https://github.com/sinaahmadi/KurdishTokenization).
 
@@ -43,10 +78,21 @@ class Tokenize:
     >>> tokenizer_ckb = Tokenize("Sorani", "Arabic")
     >>> tokenizer_ckb.word_tokenize("بە هەموو هەمووانەوە ڕێک کەوتن")
     ['▁بە▁', '▁هەموو▁', 'هەمووانەوە', '▁▁ڕێک‒کەوتن▁▁']
+    >>> list(tokenizer.word_spans("ji bo fortê xwe avêtin"))
+    [Token('ji', 0, 2, 'word', None), Token('bo', 3, 5, 'unknown', None), Token('fortê xwe avêtin', 6, 22, 'mwe', 'fortê-xwe-avêtin')]
     ```
 
     """
-    def __init__(self, dialect, script, numeral="Latin", separator='▁'):
+    def __init__(self, dialect, script, numeral="Latin", separator='▁', cache_size=100000):
+        """
+
+        Args:
+            dialect (str): the name of the dialect
+            script (str): the name of the script
+            numeral (str): the type of the numeral
+            cache_size (int): maximum number of words whose segmentation is cached by `word_tokenize`. If set to None, the cache is unbounded. If set to 0, caching is disabled.
+
+        """
 
         # validate parameters
         with open(klpt.get_data("data/tokenize.json"), encoding = "utf-8") as tokenize_file:
@@ -65,14 +111,45 @@ class Tokenize:
         self.acronyms = self.tokenize_map["sent_tokenize"][self.dialect][self.script]["acronyms"]
         self.digits = "([%s])"%"".join(list(set(list(self.preprocess_map["normalizer"]["universal"]["numerals"][numeral].values()))))
 
+        # the rules are applied in this order, one pass over the text each, as each rule depends on the periods that are protected by the previous ones
+        self.sent_rules = [(re.compile(pattern), replacement) for pattern, replacement in [
+            (self.prefixes, "\\1" + PERIOD_MARK),
+            (self.websites, PERIOD_MARK + "\\1"),
+            (r"\s" + self.alphabets + "[.] ", " \\1" + PERIOD_MARK + " "),
+            (self.acronyms + " " + self.starters, "\\1" + BOUNDARY_MARK + " \\2"),
+            (self.alphabets + "[.]" + self.alphabets + "[.]" + self.alphabets + "[.]", "\\1" + PERIOD_MARK + "\\2" + PERIOD_MARK + "\\3" + PERIOD_MARK),
+            (self.alphabets + "[.]" + self.alphabets + "[.]", "\\1" + PERIOD_MARK + "\\2" + PERIOD_MARK),
+            (" " + self.suffixes + "[.] " + self.starters, " \\1" + REMOVED_MARK + BOUNDARY_MARK + " \\2"),
+            (" " + self.suffixes + "[.]", " \\1" + PERIOD_MARK),
+            (self.digits + "[.]" + self.digits, "\\1" + PERIOD_MARK + "\\2")]]
+        punct_boundary = sorted(self.tokenize_map["sent_tokenize"][self.dialect][self.script]["punct_boundary"], key=len, reverse=True)
+        self.punct_boundary = set(punct_boundary)
+        # the boundaries are marked in the order of tokenize.json
+        self.sent_boundaries = list(self.tokenize_map["sent_tokenize"][self.dialect][self.script]["punct_boundary"])
+        # a punctuation mark followed by whitespace and the beginning of a sentence, where sent_tokenize_stream can split the text
+        self.sent_split_pattern = re.compile("[%s]\\s+\\S" % "".join([re.escape(punct) for punct in punct_boundary if len(punct) == 1]))
+
         # load lexicons
         with open(klpt.data_directory["tokenize"][self.dialect][self.script], "r", encoding = "utf-8") as f_lexicon:
             self.lexicon = json.load(f_lexicon)["Lexicon"]
          
         self.mwe_lexicon = {lemma: form for lemma, form in self.lexicon.items() if "-" in lemma}
+        self.mwe_index = self.compile_mwe_index()
 
         with open(klpt.data_directory["morphemes"][self.dialect], "r", encoding = "utf-8") as f_morphemes:
             self.morphemes = json.load(f_morphemes)["Morphemes"]["Concatenated"][self.script]
+
+        # prefixes are matched from the beginning of a word and suffixes from its end
+        self.prefix_trie = utility.build_affix_trie(self.morphemes["prefixes"])
+        self.suffix_trie = utility.build_affix_trie(self.morphemes["suffixes"], reverse=True)
+
+        # words are delimited by spaces and punctuation marks. Each punctuation mark is a word.
+        punctuation = sorted(set(self.tokenize_map["word_tokenize"][self.dialect][self.script]["punctuation"]), key=len, reverse=True)
+        self.word_pattern = re.compile("|".join([re.escape(punct) for punct in punctuation] + ["[^\\s%s]+" % "".join([re.escape(punct) for punct in punctuation if len(punct) == 1])]))
+        self.punctuation = set(punctuation)
+
+        # segmented words of word_tokenize, keyed on the word. Use `word_cache.info()` to get the statistics of the cache.
+        self.word_cache = utility.LRUCache(cache_size)
         
     
     def mwe_tokenize(self, sentence, separator="▁▁", in_separator="‒", punct_marked=False, keep_form=False):
@@ -97,89 +174,238 @@ class Tokenize:
                 if punct in sentence:
                     sentence = sentence.replace(punct, " " + punct + " ")
 
-        # look for compound words and delimit them by double separator
-        for compound_lemma in self.mwe_lexicon:
-            compound_lemma_context = " " + compound_lemma + " "
-            if compound_lemma_context in sentence:
+        # look for compound words in one left-to-right pass over the space-delimited tokens and delimit them by double separator
+        tokens = sentence.split(" ")
+        marked_tokens = list()
+        start = 0
+        while start < len(tokens):
+            compound_match = self.match_mwe(tokens, start)
+            if compound_match is None:
+                marked_tokens.append(tokens[start])
+                start += 1
+            else:
+                end, compound_lemma, compound_form = compound_match
                 if keep_form:
-                    sentence = sentence.replace(compound_lemma_context, " ▁▁" + compound_lemma + "▁▁ ")
+                    marked_tokens.append("▁▁" + compound_form + "▁▁")
                 else:
-                    sentence = sentence.replace(compound_lemma_context, " ▁▁" + compound_lemma.replace("-", in_separator) + "▁▁ ")                    
-
-            # check the possible word forms available for each compound lemma in the lex files, too
-            # Note: compound forms don't have any hyphen or separator in the lex files
-            for compound_form in self.mwe_lexicon[compound_lemma]["token_forms"]:
-                compound_form_context = " " + compound_form + " "
-                if compound_form_context in sentence:
-                    if keep_form:
-                        sentence = sentence.replace(compound_form_context, " ▁▁" + compound_form + "▁▁ ")
-                    else:
-                        sentence = sentence.replace(compound_form_context, " ▁▁" + compound_lemma.replace("-", in_separator) + "▁▁ ")
-                        
+                    marked_tokens.append("▁▁" + compound_lemma.replace("-", in_separator) + "▁▁")
+                start = end
+        sentence = " ".join(marked_tokens)
 
         # print(sentence)
         return sentence.replace("  ", " ").replace("▁▁", separator).strip()
         
 
+    def compile_mwe_index(self):
+        """Compile the multi-word expression lexicon into a token-level trie
+
+        Each compound lemma and each of its token forms is inserted as a sequence of space-delimited tokens. 
+        The value of a path is stored under the `None` key as a tuple of (lemma, form). 
+        If a form belongs to more than one lemma, the first lemma in the lexicon is kept.
+
+        Returns:
+            dict: nested dictionaries of tokens
+
+        """
+        mwe_index = dict()
+        for compound_lemma in self.mwe_lexicon:
+            # Note: compound forms don't have any hyphen or separator in the lex files
+            for compound_form in [compound_lemma] + self.mwe_lexicon[compound_lemma]["token_forms"]:
+                node = mwe_index
+                for token in compound_form.split(" "):
+                    node = node.setdefault(token, dict())
+                node.setdefault(None, (compound_lemma, compound_form))
+        return mwe_index
+
+    def match_mwe(self, tokens, start):
+        """Find the longest multi-word expression starting at a given token
+
+        Args:
+            tokens (list): space-delimited tokens of a sentence
+            start (int): index of the first token
+
+        Returns:
+            tuple: (end, lemma, form) of the longest match where `end` is the index of the token following the expression, None if no expression is found
+
+        """
+        node, longest_match = self.mwe_index, None
+        for end in range(start, len(tokens)):
+            if tokens[end] not in node:
+                break
+            node = node[tokens[end]]
+            if None in node:
+                longest_match = (end + 1,) + node[None]
+        return longest_match
+
     def word_tokenize(self, sentence, separator="▁", mwe_separator="▁▁", keep_form=False):
         """Word tokenizer
 
+        The tokens are marked by the separators based on the output of `word_spans`: 
+        words of the lexicon are surrounded by `separator` as in "▁ji▁", multi-word expressions by `mwe_separator` as in "▁▁fortê‒xwe‒avêtin▁▁", 
+        and affixes are delimited by `separator` as in "▁serok▁ê". Unknown words are returned as they are.
+
         Args:
             sentence (str): sentence or text to be tokenized
+            separator (str): a specific token to delimit words and affixes. By default ▁ is used.
+            mwe_separator (str): a specific token to delimit multi-word expressions. By default two ▁ (▁▁) are used.
+            keep_form (boolean): see `mwe_tokenize`
 
         Returns:
             [list]: [a list of words]
        
         """
-        # find multi-word expressions in the sentence
-        sentence = self.mwe_tokenize(sentence, keep_form=keep_form)
+        tokens = [self.mark_segments(segments, keep_form=keep_form) for _, segments in self.segment_sentence(sentence)]
+        return " ".join(tokens).replace("▁▁", mwe_separator).replace("▁", separator).split()
 
-        # find punctuation marks and add a space around
-        for punct in self.tokenize_map["word_tokenize"][self.dialect][self.script]["punctuation"]:
-            if punct in sentence:
-                sentence = sentence.replace(punct, " " + punct + " ")
+    def word_spans(self, sentence):
+        """Word tokenizer with character offsets
 
-        # print(sentence)
-        tokens = list()
-        # split the sentence by space and look for identifiable tokens
-        for word in sentence.strip().split():
-            if "▁▁" in word:
-                # the word is previously detected as a compound word
-                tokens.append(word)
+        The same segmentation as `word_tokenize` is provided as `Token` objects. 
+        Unlike the output of `word_tokenize`, the tokens don't need to be parsed by their separators and can be aligned with the input using their offsets.
+
+        Args:
+            sentence (str): sentence or text to be tokenized
+
+        Returns:
+            generator: `Token` objects in the order of the input
+
+        """
+        for word_start, segments in self.segment_sentence(sentence):
+            for kind, start, end, text, lemma in segments:
+                yield Token(text, word_start + start, word_start + end, kind, lemma)
+
+    def segment_sentence(self, sentence):
+        """Find the words and the multi-word expressions of a sentence and segment them
+
+        As in `mwe_tokenize`, the parts of a multi-word expression should be delimited by exactly one space.
+
+        Args:
+            sentence (str): sentence or text to be tokenized
+
+        Returns:
+            generator: tuples of (offset, segments) for each word where the segments are provided by `segment_word`
+
+        """
+        words = list(self.word_pattern.finditer(sentence))
+
+        # a word can be a part of a multi-word expression if it is neither a punctuation mark nor attached to another word by a whitespace other than space
+        mwe_parts = list()
+        for match in words:
+            start, end = match.span()
+            if match.group() in self.punctuation or (start > 0 and sentence[start - 1].isspace() and sentence[start - 1] != " ") or \
+                (end < len(sentence) and sentence[end].isspace() and sentence[end] != " "):
+                mwe_parts.append(None)
             else:
-                if word in self.lexicon:
-                    # check if the word exists in the lexicon
-                    tokens.append("▁" + word + "▁")
-                else:
-                    # the word is neither a lemma nor a compound
-                    # morphological analysis by identifying affixes and clitics
-                    token_identified = False
-
-                    for preposition in self.morphemes["prefixes"]:
-                        if word.startswith(preposition) and len(word.split(preposition, 1)) > 1:
-                            if word.split(preposition, 1)[1] in self.lexicon:
-                                word = "▁".join(["", self.morphemes["prefixes"][preposition], word.split(preposition, 1)[1], ""])
-                                token_identified = True
-                                break
-                            elif self.mwe_tokenize(word.split(preposition, 1)[1], keep_form=keep_form) != word.split(preposition, 1)[1]:
-                                word = "▁" + self.morphemes["prefixes"][preposition] + self.mwe_tokenize(word.split(preposition, 1)[1], keep_form=keep_form)
-                                token_identified = True
-                                break
-                    
-                    if not token_identified:
-                        for postposition in self.morphemes["suffixes"]:
-                            if word.endswith(postposition) and len(word.rpartition(postposition)[0]):
-                                if word.rpartition(postposition)[0] in self.lexicon:
-                                    word = "▁" + word.rpartition(postposition)[0] + "▁" + self.morphemes["suffixes"][postposition]
-                                    break
-                                elif self.mwe_tokenize(word.rpartition(postposition)[0], keep_form=keep_form) != word.rpartition(postposition)[0]:
-                                    word = ("▁" + self.mwe_tokenize(word.rpartition(postposition)[0], keep_form=keep_form) + "▁" + self.morphemes["suffixes"][postposition] + "▁").replace("▁▁▁", "▁▁")
-                                    break
-            
-                    tokens.append(word)
-        # print(tokens)
-        return " ".join(tokens).replace("▁▁", mwe_separator).replace("▁", separator).split()
+                mwe_parts.append(match.group())
+
+        index = 0
+        while index < len(words):
+            # the parts of a multi-word expression are consecutive words delimited by one space
+            run_end = index + 1
+            if mwe_parts[index] is not None:
+                while run_end < len(words) and mwe_parts[run_end] is not None and words[run_end].start() == words[run_end - 1].end() + 1 and \
+                    sentence[words[run_end - 1].end()] == " ":
+                    run_end += 1
+            compound_match = self.match_mwe(mwe_parts[index: run_end], 0) if mwe_parts[index] is not None else None
+
+            if compound_match is None:
+                word = words[index].group()
+                # the segmentation of a word only depends on the word itself, so it is cached
+                segments = self.word_cache.get(word)
+                if segments is None:
+                    segments = self.segment_word(word)
+                    self.word_cache.put(word, segments)
+                yield words[index].start(), segments
+                index += 1
+            else:
+                end, compound_lemma, compound_form = compound_match
+                start = words[index].start()
+                yield start, (("mwe", 0, len(compound_form), compound_form, compound_lemma),)
+                index += end
+
+    def segment_word(self, word):
+        """Segment a single word into its lexicon entry or multi-word expression and affixes
 
+        Args:
+            word (str): a word without any space or punctuation mark
+
+        Returns:
+            tuple: segments of the word as tuples of (kind, start, end, text, lemma) where the offsets are relative to the word. See `Token` for more details.
+
+        """
+        if word in self.lexicon:
+            # check if the word exists in the lexicon
+            return (("word", 0, len(word), word, None),)
+
+        # the word is neither a lemma nor a compound
+        # morphological analysis by identifying affixes and clitics
+        # all the affixes of the word are found in one walk over the prefix and suffix tries and tried in the order of the morpheme file
+        for preposition in utility.match_affixes(word, self.prefix_trie):
+            remainder = word[len(preposition):]
+            if remainder in self.lexicon:
+                return self.segment_affix(preposition, self.morphemes["prefixes"][preposition], 0, "prefix") + \
+                    (("word", len(preposition), len(word), remainder, None),)
+            elif None in self.mwe_index.get(remainder, {}):
+                return self.segment_affix(preposition, self.morphemes["prefixes"][preposition], 0, "prefix") + \
+                    (("mwe", len(preposition), len(word), remainder, self.mwe_index[remainder][None][0]),)
+
+        for postposition in utility.match_affixes(word, self.suffix_trie, reverse=True):
+            remainder = word[:-len(postposition)]
+            if not len(remainder):
+                continue
+            if remainder in self.lexicon:
+                return (("word", 0, len(remainder), remainder, None),) + \
+                    self.segment_affix(postposition, self.morphemes["suffixes"][postposition], len(remainder), "suffix")
+            elif None in self.mwe_index.get(remainder, {}):
+                return (("mwe", 0, len(remainder), remainder, self.mwe_index[remainder][None][0]),) + \
+                    self.segment_affix(postposition, self.morphemes["suffixes"][postposition], len(remainder), "suffix")
+
+        return (("unknown", 0, len(word), word, None),)
+
+    def segment_affix(self, affix, segmented_affix, start, kind):
+        """Split an affix into its morphemes as segmented in the morpheme file, e.g. "شت" into "ش▁ت"
+
+        If the segmented form doesn't match the affix character by character, all the morphemes are given the offsets of the whole affix.
+
+        Returns:
+            tuple: segments of the affix as tuples of (kind, start, end, text, lemma)
+
+        """
+        morphemes = segmented_affix.split("▁")
+        if "".join(morphemes) != affix:
+            return tuple([(kind, start, start + len(affix), morpheme, None) for morpheme in morphemes])
+        segments = list()
+        for morpheme in morphemes:
+            segments.append((kind, start, start + len(morpheme), morpheme, None))
+            start += len(morpheme)
+        return tuple(segments)
+
+    def mark_segments(self, segments, keep_form=False):
+        """Mark the segments of a word by ▁ and ▁▁ as in the output of `word_tokenize`
+
+        Args:
+            segments (tuple): segments of a word provided by `segment_word`
+            keep_form (boolean): see `mwe_tokenize`
+
+        Returns:
+            str: the marked word
+
+        """
+        prefixes = "▁".join([text for kind, _, _, text, _ in segments if kind == "prefix"])
+        suffixes = "▁".join([text for kind, _, _, text, _ in segments if kind == "suffix"])
+        kind, _, _, text, lemma = [segment for segment in segments if segment[0] not in ["prefix", "suffix"]][0]
+
+        if kind == "unknown":
+            return text
+        elif kind == "word":
+            if len(suffixes):
+                return "▁" + text + "▁" + suffixes
+            return "▁".join(["", prefixes, text, ""]) if len(prefixes) else "▁" + text + "▁"
+        else:
+            compound = "▁▁" + (text if keep_form else lemma.replace("-", "‒")) + "▁▁"
+            if len(suffixes):
+                return ("▁" + compound + "▁" + suffixes + "▁").replace("▁▁▁", "▁▁")
+            return "▁" + prefixes + compound if len(prefixes) else compound
 
     def sent_tokenize(self, text):
         """Sentence tokenizer
@@ -191,27 +417,86 @@ class Tokenize:
             [list]: [a list of sentences]
 
         """
-        text = " " + text + "  "
-        text = text.replace("\n", " ")
-        text = re.sub(self.prefixes, "\\1<prd>", text)
-        text = re.sub(self.websites, "<prd>\\1", text)
-        text = re.sub("\s" + self.alphabets + "[.] ", " \\1<prd> ", text)
-        text = re.sub(self.acronyms + " " + self.starters, "\\1<stop> \\2", text)
-        text = re.sub(self.alphabets + "[.]" + self.alphabets + "[.]" + self.alphabets + "[.]", "\\1<prd>\\2<prd>\\3<prd>", text)
-        text = re.sub(self.alphabets + "[.]" + self.alphabets + "[.]", "\\1<prd>\\2<prd>", text)
-        text = re.sub(" " + self.suffixes + "[.] " + self.starters, " \\1<stop> \\2", text)
-        text = re.sub(" " + self.suffixes + "[.]", " \\1<prd>", text)
-        text = re.sub(self.digits + "[.]" + self.digits, "\\1<prd>\\2", text)
-        
-        # for punct in self.tokenize_map[self.dialect][self.script]["compound_puncts"]:
-        #     if punct in text:
-        #         text = text.replace("." + punct, punct + ".")
-        
-        for punct in self.tokenize_map["sent_tokenize"][self.dialect][self.script]["punct_boundary"]:
-            text = text.replace(punct, punct + "<stop>")
-        
-        text = text.replace("<prd>", ".")
-        sentences = text.split("<stop>")
-        sentences = [s.strip() for s in sentences if len(s.strip())]
-        
-        return sentences
\ No newline at end of file
+        return [sentence for sentence, _, _ in self.sent_spans(text)]
+
+    def sent_spans(self, text):
+        """Sentence tokenizer with character offsets
+
+        The boundary rules are applied one after another on a copy of the text where each protected period and each sentence boundary is marked 
+        by a single character, as in `sent_tokenize`. The sentences and their offsets are then extracted from the segments between the boundaries.
+
+        Args:
+            text ([str]): [input text to be tokenized by sentences]
+
+        Returns:
+            generator: tuples of (sentence, start, end) where `text[start:end]` is the span of the sentence in the input. 
+                Newlines are replaced by spaces in the sentences.
+
+        """
+        marked_text = " " + text.replace("\n", " ") + "  "
+        for pattern, replacement in self.sent_rules:
+            marked_text = pattern.sub(replacement, marked_text)
+        for punct in self.sent_boundaries:
+            marked_text = marked_text.replace(punct, punct + BOUNDARY_MARK)
+
+        # the offset of a character in the input is its offset in the marked text minus the leading space and the preceding boundary marks
+        offset = -1
+        for segment in marked_text.split(BOUNDARY_MARK):
+            # a removed period is always followed by a boundary mark
+            sentence = segment.rstrip(REMOVED_MARK)
+            start, end = len(sentence) - len(sentence.lstrip()), len(sentence.rstrip())
+            if start < end:
+                yield sentence[start: end].replace(PERIOD_MARK, "."), offset + start, offset + end
+            offset += len(segment)
+
+    def sent_tokenize_stream(self, stream):
+        """Sentence tokenizer over a stream of text
+
+        The stream can be a file object or any iterable of text chunks, e.g. the lines of a file. 
+        The sentences are yielded as soon as they are complete, so that only the current sentences are kept in memory.
+        The boundaries are the same as the ones of `sent_tokenize` on the whole text.
+
+        Since the boundary rules only look at the words around a period, the text is split after a punctuation mark 
+        ending a sentence if it is followed by whitespace ending with a space or a newline, e.g. blank lines or Windows line endings, 
+        and the beginning of the next sentence. Partial sentences and abbreviations at the end of a chunk are carried over to the next chunk. 
+        The sentences are only searched again when a chunk brings a new punctuation mark followed by the beginning of a sentence.
+
+        Example:
+        ```python
+        >>> with open("news.txt", encoding="utf-8") as f:
+        ...     for sentence in tokenizer.sent_tokenize_stream(f):
+        ...         print(sentence)
+        ```
+
+        Args:
+            stream (iterable): a file object or an iterable of strings
+
+        Returns:
+            generator: sentences
+
+        """
+        if isinstance(stream, str):
+            stream = [stream]
+
+        # the buffer starts at the last split point and a new split point can only start at or after scan_start
+        buffer, scan_start = "", 0
+        for chunk in stream:
+            buffer += chunk
+            if not self.sent_split_pattern.search(buffer, scan_start):
+                scan_start = max(len(buffer.rstrip()) - 1, 0)
+                continue
+            sentences = list(self.sent_spans(buffer))
+            split_index = 0
+            for index in range(len(sentences) - 1):
+                end, next_start = sentences[index][2], sentences[index + 1][1]
+                if buffer[end: next_start].isspace() and buffer[next_start - 1] in [" ", "\n"] and buffer[end - 1] in self.punct_boundary:
+                    split_index = index + 1
+            if split_index:
+                for sentence, _, _ in sentences[:split_index]:
+                    yield sentence
+                buffer = buffer[sentences[split_index][1]:]
+            scan_start = max(len(buffer.rstrip()) - 1, 0)
+
+        for sentence, _, _ in self.sent_spans(buffer):
+            yield sentence
+
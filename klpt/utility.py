@@ -7,7 +7,18 @@
 
 """
 
+import os
+import re
 import sys
+import mmap
+import heapq
+import shutil
+import tempfile
+import struct
+import hashlib
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
 sys.path.append('../klpt')
 
 def extract_prefix_suffix(word_form, base):
@@ -23,8 +34,592 @@ def extract_prefix_suffix(word_form, base):
     if word_form == base:
         return '', word_form, ''
     elif len(word_form) > len(base):
-        for i in range(len(word_form)):
-            if word_form[i: i + len(base)] == base:
-                return word_form[0: i], base, word_form[i + len(base):]
+        i = word_form.find(base)
+        if i != -1:
+            return word_form[0: i], base, word_form[i + len(base):]
     
     return '', word_form, ''
+
+def build_affix_trie(affixes, reverse=False):
+    """Compile a list of affixes into a character trie. Suffixes are to be compiled in reverse so that they can be matched from the end of a word.
+
+    Args:
+        affixes ([list]): [affixes in the order of their priority]
+        reverse (bool, optional): [if True, the affixes are inserted from their last character]. Defaults to False.
+
+    Returns:
+        [dict]: [nested dictionaries of characters where the priority and the affix are stored under the None key]
+    """
+    trie = dict()
+    for priority, affix in enumerate(affixes):
+        node = trie
+        for char in (reversed(affix) if reverse else affix):
+            node = node.setdefault(char, dict())
+        node.setdefault(None, (priority, affix))
+    return trie
+
+def match_affixes(word, trie, reverse=False):
+    """Find all the affixes of a trie appearing at the beginning (or the end if reverse is True) of a word in a single walk
+
+    Args:
+        word ([str]): [a word]
+        trie ([dict]): [an affix trie built by build_affix_trie]
+        reverse (bool, optional): [if True, the word is walked from its last character]. Defaults to False.
+
+    Returns:
+        [list]: [a list of matching affixes sorted by their priority]
+    """
+    matches = list()
+    node = trie
+    for char in (reversed(word) if reverse else word):
+        if char not in node:
+            break
+        node = node[char]
+        if None in node:
+            matches.append(node[None])
+    return [affix for _, affix in sorted(matches)]
+
+def read_affix_rules(path):
+    """Read the prefix and suffix rules of a Hunspell affix file (.aff) with flags of one character
+
+    Args:
+        path ([str]): [the path of the affix file]
+
+    Returns:
+        [dict]: [the rules of each flag as a tuple of "PFX" or "SFX", True if the affixes can be combined with those of the other kind (cross product) 
+            and a list of (stripped characters, added affix, continuation flags, compiled condition)]
+    """
+    rules = dict()
+    with open(path, "r", encoding="utf-8") as affix_file:
+        for line in affix_file:
+            fields = line.split("#")[0].split()
+            if len(fields) < 4 or fields[0] not in ["PFX", "SFX"]:
+                continue
+            kind, flag = fields[0], fields[1]
+            if flag not in rules:
+                # the header of the rules of a flag: PFX/SFX flag cross_product number_of_rules
+                rules[flag] = (kind, fields[2] == "Y", list())
+                continue
+            affix, _, continuation = fields[3].partition("/")
+            condition = fields[4] if len(fields) > 4 else "."
+            rules[flag][2].append(("" if fields[2] == "0" else fields[2], "" if affix == "0" else affix, continuation, 
+                                   re.compile(("^(?:%s)" if kind == "PFX" else "(?:%s)$") % condition)))
+    return rules
+
+def apply_affix_rule(word, rule, kind):
+    """Apply a prefix (kind is "PFX") or suffix (kind is "SFX") rule of `read_affix_rules` to a word, None if its condition is not met"""
+    strip, affix, _, condition = rule
+    if not condition.search(word):
+        return None
+    if kind == "SFX":
+        return word[:len(word) - len(strip)] + affix if word.endswith(strip) else None
+    return affix + word[len(strip):] if word.startswith(strip) else None
+
+def expand_affixes(word, flags, rules):
+    """Generate the word-forms of a dictionary word allowed by its flags: the word with its suffixes, the suffixes allowed by their continuation flags, 
+    its prefixes and the prefixes of the suffixed forms if both allow cross products or the suffix allows the prefix. The forms may include a few 
+    which are not accepted by Hunspell, e.g. if a rule is restricted by other flags.
+
+    Args:
+        word ([str]): [a word of the dictionary]
+        flags ([str]): [its flags]
+        rules ([dict]): [rules read by read_affix_rules]
+
+    Returns:
+        [set]: [the word-forms, including the word itself]
+    """
+    forms, suffixed_forms = {word}, list()
+    for flag in flags:
+        if flag in rules and rules[flag][0] == "SFX":
+            _, cross_product, flag_rules = rules[flag]
+            for rule in flag_rules:
+                form = apply_affix_rule(word, rule, "SFX")
+                if form is None:
+                    continue
+                forms.add(form)
+                suffixed_forms.append((form, cross_product, rule[2]))
+                for continuation_flag in rule[2]:
+                    if continuation_flag in rules and rules[continuation_flag][0] == "SFX":
+                        continued_forms = [apply_affix_rule(form, continuation_rule, "SFX") for continuation_rule in rules[continuation_flag][2]]
+                        forms.update(continued_form for continued_form in continued_forms if continued_form is not None)
+
+    for flag in set(flags) | set(flag for _, _, continuation in suffixed_forms for flag in continuation):
+        if flag in rules and rules[flag][0] == "PFX":
+            _, cross_product, flag_rules = rules[flag]
+            bases = ([word] if flag in flags else []) + [form for form, suffix_cross_product, continuation in suffixed_forms 
+                                                          if flag in continuation or (flag in flags and cross_product and suffix_cross_product)]
+            for rule in flag_rules:
+                forms.update(form for form in [apply_affix_rule(base, rule, "PFX") for base in bases] if form is not None)
+    return forms
+
+class LRUCache:
+    """A bounded cache with a least-recently-used eviction policy
+
+    The number of hits, misses and evictions are counted so that the size of the cache can be tuned. The cache can be shared by threads 
+    as the concurrent accesses cannot corrupt it, though the counters are approximate in that case.
+
+    Example:
+    ```python
+    >>> from klpt.utility import LRUCache
+    >>> cache = LRUCache(maxsize=2)
+    >>> cache.put("a", 1)
+    >>> cache.put("b", 2)
+    >>> cache.get("a")
+    1
+    >>> cache.put("c", 3) # "b" is the least recently used item and is evicted
+    >>> cache.get("b") is None
+    True
+    >>> cache.info()
+    {'hits': 1, 'misses': 1, 'evictions': 1, 'size': 2, 'maxsize': 2}
+    ```
+    """
+    def __init__(self, maxsize=100000):
+        """
+
+        Args:
+            maxsize (int): maximum number of items in the cache. If set to None, the cache is unbounded. If set to 0, nothing is cached.
+
+        """
+        if maxsize is not None and maxsize < 0:
+            raise ValueError("The size of the cache should be a non-negative integer or None.")
+        self.maxsize = maxsize
+        self.items = OrderedDict()
+        self.hits, self.misses, self.evictions = 0, 0, 0
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, key):
+        return key in self.items
+
+    def get(self, key, default=None):
+        """Return the cached value of a key and mark it as the most recently used one
+
+        Args:
+            key ([hashable]): [the key]
+            default (optional): [value returned if the key is not cached]. Defaults to None.
+        """
+        try:
+            self.items.move_to_end(key)
+            value = self.items[key]
+        except KeyError:
+            # the key is not cached or has just been evicted by another thread
+            self.misses += 1
+            return default
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """Cache a value and evict the least recently used items if the cache is full
+
+        Args:
+            key ([hashable]): [the key]
+            value ([object]): [the value]
+        """
+        if self.maxsize == 0:
+            return
+        self.items[key] = value
+        self.items.move_to_end(key)
+        if self.maxsize is not None:
+            while len(self.items) > self.maxsize:
+                try:
+                    self.items.popitem(last=False)
+                except KeyError:
+                    break
+                self.evictions += 1
+
+    def pop(self, key, default=None):
+        """Remove a key from the cache without counting it as an eviction"""
+        return self.items.pop(key, default)
+
+    def clear(self):
+        """Remove all the cached items and reset the counters"""
+        self.items.clear()
+        self.hits, self.misses, self.evictions = 0, 0, 0
+
+    def info(self):
+        """Statistics of the cache
+
+        Returns:
+            [dict]: [number of hits, misses and evictions, and the current and maximum size of the cache]
+        """
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "size": len(self.items), "maxsize": self.maxsize}
+
+def edit_distance(source, target, max_distance=None):
+    """Damerau-Levenshtein distance (optimal string alignment) between two strings where a transposition of two adjacent characters costs 1
+
+    Args:
+        source ([str]): [a string]
+        target ([str]): [another string]
+        max_distance ([int], optional): [if given, the computation stops as soon as the distance exceeds it and max_distance + 1 is returned]. Defaults to None.
+
+    Returns:
+        [int]: [the distance]
+    """
+    # the common prefix and suffix do not change the distance
+    start, source_end, target_end = 0, len(source), len(target)
+    while start < source_end and start < target_end and source[start] == target[start]:
+        start += 1
+    while source_end > start and target_end > start and source[source_end - 1] == target[target_end - 1]:
+        source_end, target_end = source_end - 1, target_end - 1
+    source, target = source[start: source_end], target[start: target_end]
+
+    limit = max(len(source), len(target)) if max_distance is None else max_distance
+    if abs(len(source) - len(target)) > limit:
+        return limit + 1
+    if not len(source) or not len(target):
+        return max(len(source), len(target))
+
+    previous_row, row = None, list(range(len(target) + 1))
+    for i in range(1, len(source) + 1):
+        before_previous_row, previous_row, row = previous_row, row, [i] * (len(target) + 1)
+        source_char = source[i - 1]
+        row_minimum = i
+        for j in range(1, len(target) + 1):
+            distance = previous_row[j - 1] + (source_char != target[j - 1])
+            if previous_row[j] + 1 < distance:
+                distance = previous_row[j] + 1
+            if row[j - 1] + 1 < distance:
+                distance = row[j - 1] + 1
+            if i > 1 and j > 1 and source_char == target[j - 2] and source[i - 2] == target[j - 1] and before_previous_row[j - 2] + 1 < distance:
+                distance = before_previous_row[j - 2] + 1
+            row[j] = distance
+            if distance < row_minimum:
+                row_minimum = distance
+        if row_minimum > limit:
+            return limit + 1
+    return min(row[-1], limit + 1)
+
+def deletes(word, max_distance):
+    """All the strings obtained by deleting up to max_distance characters of a word, including the word itself
+
+    Args:
+        word ([str]): [a word]
+        max_distance ([int]): [maximum number of deleted characters]
+
+    Returns:
+        [set]: [the deletes]
+    """
+    results, edits = {word}, {word}
+    for _ in range(max_distance):
+        edits = {edit[:i] + edit[i + 1:] for edit in edits for i in range(len(edit))}
+        results |= edits
+    return results
+
+def delete_hash(word):
+    """A 64-bit hash of a string which is stable across processes, unlike `hash`"""
+    return int.from_bytes(hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest(), "little")
+
+# magic number, byte order, max_distance, prefix_length, number of words, number of deletes and size of the words in UTF-8
+DELETION_INDEX_HEADER = struct.Struct("<8s8sIIIII")
+DELETION_INDEX_MAGIC = b"KLPTDEL1"
+
+def build_deletion_index(words, path, max_distance=2, prefix_length=7):
+    """Build a symmetric delete spelling correction index (as in SymSpell) and save it to be loaded by `DeletionIndex`
+
+    The deletes of the first `prefix_length` characters of each word up to `max_distance` are hashed and sorted so that they can be searched in a memory-mapped file.
+
+    Args:
+        words ([iterable]): [words or a dictionary of words and their frequencies. The frequency of words of a list is 1.]
+        path ([str]): [the path of the index file]
+        max_distance (int, optional): [maximum edit distance of the suggestions]. Defaults to 2.
+        prefix_length (int, optional): [number of the characters of the words whose deletes are indexed]. Defaults to 7.
+    """
+    frequencies = dict()
+    for word in words:
+        frequencies[word] = max(frequencies.get(word, 0), words[word] if isinstance(words, dict) else 1)
+    word_list = sorted(frequencies)
+
+    entries = list()
+    for word_id, word in enumerate(word_list):
+        for edit in deletes(word[:prefix_length], max_distance):
+            entries.append((delete_hash(edit), word_id))
+    entries.sort()
+
+    encoded_words = [word.encode("utf-8") for word in word_list]
+    word_offsets = array("I", [0])
+    for encoded_word in encoded_words:
+        word_offsets.append(word_offsets[-1] + len(encoded_word))
+    header = DELETION_INDEX_HEADER.pack(DELETION_INDEX_MAGIC, sys.byteorder.encode("ascii"), max_distance, prefix_length, 
+                                        len(word_list), len(entries), word_offsets[-1])
+    with open(path, "wb") as index_file:
+        # 8-byte hashes first so that all the arrays are aligned
+        index_file.write(header + b"\0" * (-len(header) % 8))
+        index_file.write(array("Q", [delete_hash for delete_hash, _ in entries]).tobytes())
+        index_file.write(array("I", [word_id for _, word_id in entries]).tobytes())
+        index_file.write(word_offsets.tobytes())
+        index_file.write(array("I", [min(frequencies[word], 2 ** 32 - 1) for word in word_list]).tobytes())
+        index_file.write(b"".join(encoded_words))
+
+class DeletionIndex:
+    """A symmetric delete spelling correction index built by `build_deletion_index`
+
+    The index file is memory-mapped: loading it is immediate and its pages are shared by the processes using the same file.
+
+    Example:
+    ```python
+    >>> from klpt.utility import build_deletion_index, DeletionIndex
+    >>> build_deletion_index({"kirin": 10, "kirîn": 2, "kir": 5}, "words.index")
+    >>> index = DeletionIndex("words.index")
+    >>> index.lookup("kirn")
+    ['kirin', 'kir', 'kirîn']
+    ```
+    """
+    def __init__(self, path):
+        """
+
+        Args:
+            path ([str]): [the path of the index file]
+
+        Raises:
+            ValueError: [if the file is not a deletion index or it was built on a machine with another byte order]
+        """
+        with open(path, "rb") as index_file:
+            self.buffer = mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, byteorder, self.max_distance, self.prefix_length, word_count, delete_count, words_size = DELETION_INDEX_HEADER.unpack_from(self.buffer)
+        if magic != DELETION_INDEX_MAGIC or byteorder.rstrip(b"\0").decode("ascii") != sys.byteorder:
+            self.buffer.close()
+            raise ValueError("%s is not a deletion index built on this machine." % path)
+
+        view = memoryview(self.buffer)
+        start = DELETION_INDEX_HEADER.size + (-DELETION_INDEX_HEADER.size % 8)
+        self.delete_hashes = view[start: start + 8 * delete_count].cast("Q")
+        start += 8 * delete_count
+        self.delete_words = view[start: start + 4 * delete_count].cast("I")
+        start += 4 * delete_count
+        self.word_offsets = view[start: start + 4 * (word_count + 1)].cast("I")
+        start += 4 * (word_count + 1)
+        self.frequencies = view[start: start + 4 * word_count].cast("I")
+        start += 4 * word_count
+        self.words = view[start: start + words_size]
+
+    def __len__(self):
+        return len(self.frequencies)
+
+    def word(self, word_id):
+        """The word of an identifier"""
+        return bytes(self.words[self.word_offsets[word_id]: self.word_offsets[word_id + 1]]).decode("utf-8")
+
+    def lookup(self, word, max_distance=None, max_suggestions=None):
+        """Find the words of the index within an edit distance of a word
+
+        Args:
+            word ([str]): [a word]
+            max_distance ([int], optional): [maximum edit distance, up to the one of the index]. Defaults to the one of the index.
+            max_suggestions ([int], optional): [maximum number of the suggestions]. Defaults to None, i.e. all of them.
+
+        Returns:
+            [list]: [the suggestions sorted by their edit distance, their frequency (descending) and alphabetically]
+        """
+        max_distance = self.max_distance if max_distance is None else min(max_distance, self.max_distance)
+        word_ids = set()
+        for edit in deletes(word[:self.prefix_length], max_distance):
+            edit_hash = delete_hash(edit)
+            i = bisect_left(self.delete_hashes, edit_hash)
+            while i < len(self.delete_hashes) and self.delete_hashes[i] == edit_hash:
+                word_ids.add(self.delete_words[i])
+                i += 1
+
+        suggestions = list()
+        for word_id in word_ids:
+            candidate = self.word(word_id)
+            distance = edit_distance(word, candidate, max_distance)
+            if distance <= max_distance:
+                suggestions.append((distance, -self.frequencies[word_id], candidate))
+        return [candidate for _, _, candidate in sorted(suggestions)][:max_suggestions]
+
+    def close(self):
+        """Release the memory-mapped file"""
+        for view in [self.delete_hashes, self.delete_words, self.word_offsets, self.frequencies, self.words]:
+            view.release()
+        self.buffer.close()
+
+# magic number, byte order, number of keys, number of values, number of postings, size of the keys and the values in UTF-8
+INVERTED_INDEX_HEADER = struct.Struct("<8s8sIIIII")
+INVERTED_INDEX_MAGIC = b"KLPTINV1"
+
+def build_inverted_index(mapping, path):
+    """Save a mapping of strings to lists of strings, e.g. lemmata to word-forms, in a compact file to be loaded by `InvertedIndex`
+
+    The keys are sorted and each value is stored once in UTF-8, the lists referring to the values by their identifier. A key without values is left out.
+
+    Args:
+        mapping ([dict]): [a dictionary of strings and iterables of strings]
+        path ([str]): [the path of the index file]
+    """
+    build_inverted_index_from_pairs(((key, value) for key in mapping for value in mapping[key]), path)
+
+def sort_lines(lines, directory, chunk_size):
+    """Sort lines without duplicates with a bounded memory: the lines are sorted by chunks saved in temporary files which are then merged
+
+    Args:
+        lines ([iterable]): [strings without line breaks]
+        directory ([str]): [the directory of the temporary files]
+        chunk_size ([int]): [maximum number of lines kept in memory]
+
+    Returns:
+        [generator]: [the sorted unique lines]
+    """
+    runs, chunk = list(), set()
+    for line in lines:
+        chunk.add(line)
+        if len(chunk) >= chunk_size:
+            with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=directory, suffix=".run", delete=False) as run_file:
+                run_file.writelines(line + "\n" for line in sorted(chunk))
+            runs.append(run_file.name)
+            chunk = set()
+    run_files = [open(run, "r", encoding="utf-8") for run in runs]
+    try:
+        previous = None
+        for line in heapq.merge(sorted(chunk), *[(line[:-1] for line in run_file) for run_file in run_files]):
+            if line != previous:
+                yield line
+                previous = line
+    finally:
+        for run_file in run_files:
+            run_file.close()
+            os.remove(run_file.name)
+
+def build_inverted_index_from_pairs(pairs, path, chunk_size=1000000):
+    """Save (key, value) pairs of strings in the file format of `build_inverted_index` without keeping them in memory, e.g. the pairs of 
+    lemmata and word-forms of a large vocabulary. The pairs are sorted by chunks of `chunk_size` in temporary files next to the index file 
+    (see `sort_lines`), once by value to number the unique values and once by key to write the lists of value identifiers.
+
+    Args:
+        pairs ([iterable]): [(key, value) tuples of strings without tabs and line breaks, possibly repeated]
+        path ([str]): [the path of the index file]
+        chunk_size ([int]): [maximum number of pairs kept in memory]
+    """
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(path))) as directory:
+        sections = {name: open(os.path.join(directory, name), "w+b") for name in ["key_offsets", "posting_offsets", "postings", "value_offsets", "keys", "values"]}
+        counts = {"keys": 0, "values": 0, "postings": 0, "keys_size": 0, "values_size": 0}
+        # the offsets and the postings are written by blocks
+        blocks = {name: array("I") for name in ["key_offsets", "posting_offsets", "postings", "value_offsets"]}
+
+        def write_offset(name, offset):
+            blocks[name].append(offset)
+            if len(blocks[name]) >= 65536:
+                sections[name].write(blocks[name].tobytes())
+                del blocks[name][:]
+
+        def numbered_pairs():
+            # the values are numbered in their sorted order and the pairs are given as "key\tidentifier" lines
+            previous_value = None
+            for line in sort_lines(("%s\t%s" % (value, key) for key, value in pairs), directory, chunk_size):
+                value, key = line.split("\t")
+                if value != previous_value:
+                    encoded_value = value.encode("utf-8")
+                    sections["values"].write(encoded_value)
+                    counts["values_size"] += len(encoded_value)
+                    write_offset("value_offsets", counts["values_size"])
+                    counts["values"] += 1
+                    previous_value = value
+                yield "%s\t%010d" % (key, counts["values"] - 1)
+
+        write_offset("value_offsets", 0)
+        write_offset("key_offsets", 0)
+        write_offset("posting_offsets", 0)
+        previous_key = None
+        for line in sort_lines(numbered_pairs(), directory, chunk_size):
+            key, value_id = line.split("\t")
+            if key != previous_key:
+                if previous_key is not None:
+                    write_offset("posting_offsets", counts["postings"])
+                encoded_key = key.encode("utf-8")
+                sections["keys"].write(encoded_key)
+                counts["keys_size"] += len(encoded_key)
+                write_offset("key_offsets", counts["keys_size"])
+                counts["keys"] += 1
+                previous_key = key
+            write_offset("postings", int(value_id))
+            counts["postings"] += 1
+        if previous_key is not None:
+            write_offset("posting_offsets", counts["postings"])
+        for name in blocks:
+            sections[name].write(blocks[name].tobytes())
+
+        header = INVERTED_INDEX_HEADER.pack(INVERTED_INDEX_MAGIC, sys.byteorder.encode("ascii"), counts["keys"], counts["values"], counts["postings"], 
+                                            counts["keys_size"], counts["values_size"])
+        with open(path, "wb") as index_file:
+            index_file.write(header + b"\0" * (-len(header) % 8))
+            for name in ["key_offsets", "posting_offsets", "postings", "value_offsets", "keys", "values"]:
+                sections[name].seek(0)
+                shutil.copyfileobj(sections[name], index_file)
+                sections[name].close()
+
+class InvertedIndex:
+    """A mapping of strings to lists of strings built by `build_inverted_index` which is memory-mapped and searched without being loaded
+
+    Example:
+    ```python
+    >>> from klpt.utility import build_inverted_index, InvertedIndex
+    >>> build_inverted_index({"kirin": ["dikim", "kir", "kirin"], "mal": ["mal", "malan"]}, "forms.index")
+    >>> index = InvertedIndex("forms.index")
+    >>> index.get("mal")
+    ['mal', 'malan']
+    ```
+    """
+    def __init__(self, path):
+        """
+
+        Args:
+            path ([str]): [the path of the index file]
+
+        Raises:
+            ValueError: [if the file is not an inverted index or it was built on a machine with another byte order]
+        """
+        with open(path, "rb") as index_file:
+            self.buffer = mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, byteorder, key_count, value_count, posting_count, keys_size, values_size = INVERTED_INDEX_HEADER.unpack_from(self.buffer)
+        if magic != INVERTED_INDEX_MAGIC or byteorder.rstrip(b"\0").decode("ascii") != sys.byteorder:
+            self.buffer.close()
+            raise ValueError("%s is not an inverted index built on this machine." % path)
+
+        view = memoryview(self.buffer)
+        start = INVERTED_INDEX_HEADER.size + (-INVERTED_INDEX_HEADER.size % 8)
+        arrays = list()
+        for length in [key_count + 1, key_count + 1, posting_count, value_count + 1]:
+            arrays.append(view[start: start + 4 * length].cast("I"))
+            start += 4 * length
+        self.key_offsets, self.posting_offsets, self.postings, self.value_offsets = arrays
+        self.keys = view[start: start + keys_size]
+        self.values = view[start + keys_size: start + keys_size + values_size]
+
+    def __len__(self):
+        return len(self.key_offsets) - 1
+
+    def __contains__(self, key):
+        return self.find(key) is not None
+
+    def find(self, key):
+        """The position of a key in the sorted keys, None if it does not exist"""
+        encoded_key = key.encode("utf-8")
+        low, high = 0, len(self)
+        while low < high:
+            middle = (low + high) // 2
+            if self.keys[self.key_offsets[middle]: self.key_offsets[middle + 1]].tobytes() < encoded_key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < len(self) and self.keys[self.key_offsets[low]: self.key_offsets[low + 1]].tobytes() == encoded_key:
+            return low
+        return None
+
+    def get(self, key, default=None):
+        """The list of strings of a key
+
+        Args:
+            key ([str]): [the key]
+            default (optional): [value returned if the key does not exist]. Defaults to None.
+        """
+        position = self.find(key)
+        if position is None:
+            return default
+        return [self.values[self.value_offsets[value_id]: self.value_offsets[value_id + 1]].tobytes().decode("utf-8") 
+                for value_id in self.postings[self.posting_offsets[position]: self.posting_offsets[position + 1]]]
+
+    def close(self):
+        """Release the memory-mapped file"""
+        for view in [self.key_offsets, self.posting_offsets, self.postings, self.value_offsets, self.keys, self.values]:
+            view.release()
+        self.buffer.close()
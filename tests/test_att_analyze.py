@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+sys.path.append('../klpt')
+import os
+import gzip
+import tempfile
+import unittest
+from klpt.att_analyze import ATTFST, Analysis, compile_att
+
+
+ATT = u"""0\t1\tm\tm\t0.0
+1\t2\ta\ta\t0.0
+2\t3\tl\tl\t0.0
+3\t4\t@0@\t<n>\t0.0
+3\t5\tan\t<n><pl>\t1.0
+4
+5\t0.5
+"""
+
+class TestATTAnalyze(unittest.TestCase):
+    """ Test unit for the ATTFST and Analysis classes"""
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.attfile = os.path.join(self.directory.name, "test.att")
+        with open(self.attfile, "w", encoding = "utf-8") as f:
+            f.write(ATT)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_compiled_cache(self):
+        cache_file = os.path.join(self.directory.name, "test.att.cache")
+        t = ATTFST(self.attfile, cache_file = cache_file)
+        self.assertTrue(os.path.exists(cache_file))
+        self.assertTrue(t.weighted)
+        self.assertEqual(list(t.apply("mal")), [("mal<n>", 0.0)])
+        self.assertEqual(list(t.apply("malan")), [("mal<n><pl>", 1.5)])
+        self.assertEqual(list(t.apply("mal<n><pl>", dir = "up")), [("malan", 1.5)])
+        t.close()
+
+        # the cache is reused and recompiled when the source changes
+        modified = os.path.getmtime(cache_file)
+        t = ATTFST(self.attfile, cache_file = cache_file)
+        self.assertEqual(os.path.getmtime(cache_file), modified)
+        t.close()
+        with open(self.attfile, "a", encoding = "utf-8") as f:
+            f.write(u"3\t4\tê\t<n><ez>\t0.0\n")
+        t = ATTFST(self.attfile, cache_file = cache_file)
+        self.assertEqual(list(t.apply("malê")), [("mal<n><ez>", 0.0)])
+        t.close()
+
+        with open(cache_file, "rb") as f:
+            self.assertEqual(f.read(), compile_att(open(self.attfile, "rb").read()))
+
+        # by default, the image is cached in the user's cache directory rather than next to the source
+        cache_home = os.environ.get("XDG_CACHE_HOME")
+        os.environ["XDG_CACHE_HOME"] = os.path.join(self.directory.name, "cache")
+        try:
+            t = ATTFST(self.attfile)
+            self.assertEqual(len(os.listdir(os.path.join(self.directory.name, "cache", "klpt"))), 1)
+            self.assertFalse(os.path.exists(self.attfile + ".bin"))
+            t.close()
+        finally:
+            if cache_home is None:
+                del os.environ["XDG_CACHE_HOME"]
+            else:
+                os.environ["XDG_CACHE_HOME"] = cache_home
+
+    def test_tokenize(self):
+        t = ATTFST(self.attfile, cache_file = False)
+        self.assertEqual(t.tokenize("malan"), ["m", "a", "l", "an"])
+        self.assertEqual(t.tokenize("mal<pl"), ["m", "a", "l", "<", "p", "l"])
+        self.assertEqual(t.tokenize("mal<n><pl><n>"), ["m", "a", "l", "<n><pl>", "<n>"])
+        t.tokenize("malan")
+        self.assertEqual(t.token_cache.info()["hits"], 1)
+        t.close()
+
+    def test_limits(self):
+        with open(self.attfile, "a", encoding = "utf-8") as f:
+            f.write(u"3\t6\t@0@\t<n>\t0.0\n6\t3\t@0@\t@0@\t0.0\n3\t4\t@0@\t<adj>\t0.0\n")
+        t = ATTFST(self.attfile, cache_file = False)
+        # the epsilon cycle 3 -> 6 -> 3 is not followed again
+        self.assertCountEqual(list(t.apply("mal")), [("mal<n>", 0.0), ("mal<adj>", 0.0)])
+        self.assertGreater(t.explored, 0)
+        self.assertFalse(t.truncated)
+        self.assertEqual(len(list(t.apply("mal", max_results = 1))), 1)
+        self.assertTrue(t.truncated)
+        self.assertEqual(list(t.apply("mal", max_states = 2)), [])
+        self.assertEqual(t.explored, 2)
+        self.assertEqual(list(t.apply("malan", max_cost = 1.0)), [])
+        t.close()
+
+    def test_unweighted(self):
+        with open(self.attfile, "w", encoding = "utf-8") as f:
+            f.write(ATT.replace("\t1.0\n", "\t0.0\n").replace("5\t0.5", "5"))
+        t = ATTFST(self.attfile, cache_file = False)
+        self.assertFalse(t.weighted)
+        self.assertEqual(list(t.apply("malan")), [("mal<n><pl>", 0.0)])
+        self.assertEqual(list(t.apply("malan", max_cost = 0.0)), [("mal<n><pl>", 0.0)])
+        self.assertEqual(list(t.apply("mal<n>", dir = "up", return_joined = False)), [(["m", "a", "l", ""], 0.0)])
+        t.prepare()
+        self.assertEqual(len(t.closures["down"]), 6)
+        self.assertEqual([closure_state for closure_state, _, _, _ in t.closures["down"][3]], [3, 4])
+        t.close()
+
+    def test_gzip(self):
+        with gzip.open(self.attfile + ".gz", "wt", encoding = "utf-8") as f:
+            f.write(ATT)
+        t = ATTFST(self.attfile + ".gz", cache_file = False)
+        self.assertEqual(list(t.apply("malan")), [("mal<n><pl>", 1.5)])
+        t.close()
+
+    def test_analyze(self):
+        analyzer = Analysis("Kurmanji", "Latin")
+        self.assertEqual(analyzer.analyze("dibêjim"), [("gotin<vblex><tv><pri><p1><sg>", 0.0)])
+        self.assertEqual(len(analyzer.analyze("malan", max_results = 2)), 2)
+
+    def test_analyze_many(self):
+        analyzer = Analysis("Kurmanji", "Latin")
+        words = ["malan", "mal", "dibêjim", "malê", "mal", "xyz", ""]
+        analyses = analyzer.analyze_many(words)
+        self.assertEqual(list(analyses), sorted(set(words)))
+        for word in words:
+            self.assertEqual(analyses[word], analyzer.analyze(word))
+        self.assertEqual(analyzer.analyze_many(words, workers = 2), analyses)
+
+        t = ATTFST(self.attfile, cache_file = False)
+        self.assertEqual(t.apply_many(["mal", "malan", "ma"]), {"ma": [], "mal": [("mal<n>", 0.0)], "malan": [("mal<n><pl>", 1.5)]})
+        t.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
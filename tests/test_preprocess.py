@@ -45,6 +45,25 @@ class TestPreprocess(unittest.TestCase):
                 prep = Preprocess("Sorani", "Latin", numeral)
                 self.assertCountEqual(prep.unify_numerals(case), self.test_cases["numerals"][numeral][case])
 
+    def test_unify_numerals_bulk(self):
+        for numeral in self.options["numerals"]:
+            prep = Preprocess("Sorani", "Latin", numeral)
+            cases = list(self.test_cases["numerals"][numeral])
+            expected = [self.test_cases["numerals"][numeral][case] for case in cases]
+            self.assertEqual(prep.unify_numerals(cases), expected)
+            buffer = "\n".join(cases).encode("utf-8")
+            self.assertEqual(prep.unify_numerals(buffer).decode("utf-8"), "\n".join(expected))
+            self.assertEqual(prep.unify_numerals(memoryview(buffer)).decode("utf-8"), "\n".join(expected))
+
+    def test_preprocess(self):
+        for dialect in self.options["dialects"]:
+            for script in self.options["scripts"]:
+                cases = list(self.test_cases["normalizer"][dialect][script]) + list(self.test_cases["standardizer"][dialect][script]) + list(self.test_cases["numerals"]["Latin"])
+                for numeral in self.options["numerals"]:
+                    prep = Preprocess(dialect, script, numeral)
+                    for case in cases:
+                        self.assertEqual(prep.preprocess(case), prep.unify_numerals(prep.standardize(prep.normalize(case))))
+
     def test_stopwords(self):
         # print("stopwords")
         for dialect in self.options["dialects"]:
@@ -53,5 +72,17 @@ class TestPreprocess(unittest.TestCase):
                     prep = Preprocess(dialect, script)
                     self.assertCountEqual([token for token in case.split() if token not in prep.stopwords], self.test_cases["stopwords"][dialect][script][case])
 
+    def test_remove_stopwords(self):
+        for dialect in self.options["dialects"]:
+            for script in self.options["scripts"]:
+                prep = Preprocess(dialect, script)
+                cases = list(self.test_cases["stopwords"][dialect][script])
+                for case in cases:
+                    self.assertEqual(prep.remove_stopwords(case.split()), self.test_cases["stopwords"][dialect][script][case])
+                    marked_tokens = ["▁" + token + "▁" for token in case.split()]
+                    self.assertEqual(prep.remove_stopwords(marked_tokens), ["▁" + token + "▁" for token in self.test_cases["stopwords"][dialect][script][case]])
+                self.assertEqual(list(prep.remove_stopwords_stream(case.split() for case in cases)), 
+                                [self.test_cases["stopwords"][dialect][script][case] for case in cases])
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
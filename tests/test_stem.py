@@ -3,11 +3,24 @@
 
 import sys
 sys.path.append('../klpt')
+import os
+import tempfile
+import threading
+import time
 import unittest
-from klpt.stem import Stem
+from klpt.stem import Stem, MorphologicalAnalysis
+from klpt import stem
+from klpt.utility import build_deletion_index, DeletionIndex, edit_distance, build_inverted_index, build_inverted_index_from_pairs, InvertedIndex
 import json
 import klpt
 
+class SlowHunspell:
+    """A Hunspell stub whose suggestions of "slow" never come in time"""
+    def suggest(self, word):
+        if word == "slow":
+            time.sleep(60)
+        return [word + "s"]
+
 class TestStem(unittest.TestCase):
     """ Test unit for the Stem class"""
     def setUp(self):
@@ -43,5 +56,314 @@ class TestStem(unittest.TestCase):
                 else: # otherwise, not supported currently
                     pass
 
+    def test_analyze_compact(self):
+        for dialect, script in [("Sorani", "Arabic"), ("Kurmanji", "Latin")]:
+            stemmer = Stem(dialect, script)
+            for test_case in self.test_cases["lemmatize"][dialect][script]:
+                compact_analysis = stemmer.analyze(test_case, compact=True)
+                self.assertTrue(all(isinstance(analysis, MorphologicalAnalysis) for analysis in compact_analysis))
+                self.assertEqual([analysis.to_dict() for analysis in compact_analysis], stemmer.analyze(test_case))
+
+        stemmer = Stem("Sorani", "Arabic")
+        self.assertEqual(stemmer.parse_analysis("دیتبامن", "po:verb is:past_stem_transitive_active st:دی lem:دیتن دیت:ts بامن"), 
+            MorphologicalAnalysis(("verb",), "past_stem_transitive_active", "دی", ("دیتن",), "دیت", "", "بامن"))
+        self.assertEqual(stemmer.parse_analysis("گوڵەکانم", "po:noun st:گوڵ گوڵە:ts کانم").to_dict(), 
+            {"pos": ["noun"], "stem": "گوڵ", "lemma": ["گوڵە"], "base": "گوڵە", "prefixes": "", "suffixes": "کانم"})
+
+        # the cached analyses cannot be modified by the caller
+        stemmer = Stem("Sorani", "Arabic", cache_size=100)
+        word = [test_case for test_case in self.test_cases["lemmatize"]["Sorani"]["Arabic"] if stemmer.analyze(test_case)][0]
+        analysis = stemmer.analyze(word, compact=True)[0]
+        self.assertRaises(AttributeError, setattr, analysis, "lemma", ("",))
+        self.assertEqual(stemmer.analyze(word, compact=True)[0], analysis)
+
+        # a non-verb analysis without a base has no lemma
+        self.assertEqual(stemmer.parse_analysis("گوڵ", "po:noun st:گوڵ").lemma, (None,))
+        class NoBaseHunspell:
+            def analyze(self, word):
+                return ["po:noun st:" + word]
+        stemmer.huns = NoBaseHunspell()
+        stemmer.clear_cache()
+        self.assertEqual(stemmer.lemmatize("گوڵ"), [])
+        self.assertEqual(stemmer.lemmatize_many(["گوڵ"]), [[]])
+
+    def test_stem_remainders(self):
+        stemmer = Stem("Sorani", "Arabic")
+        self.assertEqual(stemmer.stem("گورەکە", mark_unknown=True), ["_گور_"])
+        # the remainders which cannot be stemmed are cached as well
+        self.assertIn((), [stemmer.remainder_cache.get(remainder) for remainder in list(stemmer.remainder_cache.items)])
+        misses = stemmer.remainder_cache.info()["misses"]
+        self.assertEqual(stemmer.stem("گورەکە", mark_unknown=True), ["_گور_"])
+        self.assertEqual(stemmer.remainder_cache.info()["misses"], misses)
+        stemmer.clear_cache()
+        self.assertEqual(len(stemmer.remainder_cache), 0)
+
+    def test_cache(self):
+        stemmer, cached_stemmer = Stem("Sorani", "Arabic"), Stem("Sorani", "Arabic", cache_size=2)
+        for _ in range(2):
+            for test_case in self.test_cases["lemmatize"]["Sorani"]["Arabic"]:
+                self.assertCountEqual(cached_stemmer.lemmatize(test_case), stemmer.lemmatize(test_case))
+                self.assertCountEqual(cached_stemmer.analyze(test_case), stemmer.analyze(test_case))
+                self.assertCountEqual(cached_stemmer.stem(test_case), stemmer.stem(test_case))
+                self.assertEqual(cached_stemmer.check_spelling(test_case), stemmer.check_spelling(test_case))
+        self.assertEqual(cached_stemmer.cache_info()["size"], 2)
+        self.assertGreater(cached_stemmer.cache_info()["evictions"], 0)
+
+        # the output can be modified without modifying the cache
+        word = list(self.test_cases["lemmatize"]["Sorani"]["Arabic"])[0]
+        cached_stemmer.analyze(word)[0]["lemma"].append("")
+        self.assertCountEqual(cached_stemmer.analyze(word), stemmer.analyze(word))
+        self.assertGreater(cached_stemmer.cache_info()["hits"], 0)
+
+        cached_stemmer.clear_cache()
+        self.assertEqual(cached_stemmer.cache_info(), {"hits": 0, "misses": 0, "evictions": 0, "size": 0, "maxsize": 2})
+        self.assertEqual(stemmer.cache_info()["size"], 0)
+
+    def test_many(self):
+        for dialect, script in [("Sorani", "Arabic"), ("Kurmanji", "Latin")]:
+            stemmer = Stem(dialect, script)
+            words = list(self.test_cases["lemmatize"][dialect][script]) + [case for test_case in self.test_cases["stem"][dialect][script] for case in test_case["cases"]]
+            words = words + words[::-1]
+            for word, stems in zip(words, stemmer.stem_many(words, mark_unknown=True)):
+                self.assertCountEqual(stems, stemmer.stem(word, mark_unknown=True))
+            for word, word_analysis in zip(words, stemmer.analyze_many(words)):
+                self.assertCountEqual(word_analysis, stemmer.analyze(word))
+            for word, lemmata in zip(words, stemmer.lemmatize_many(words)):
+                self.assertCountEqual(lemmata, stemmer.lemmatize(word))
+            self.assertEqual(stemmer.check_many(words), [stemmer.check_spelling(word) for word in words])
+            self.assertRaises(TypeError, stemmer.stem_many, [words[0], None])
+
+            # bulk functions of Hunspell are used when available
+            class BulkHunspell:
+                def __init__(self, huns):
+                    self.huns, self.calls, self.single_calls = huns, 0, 0
+                def bulk_stem(self, words):
+                    self.calls += 1
+                    return {word: self.huns.stem(word) for word in words}
+                def bulk_analyze(self, words):
+                    self.calls += 1
+                    return {word: self.huns.analyze(word) for word in words}
+                def stem(self, word):
+                    self.single_calls += 1
+                    return self.huns.stem(word)
+                def analyze(self, word):
+                    self.single_calls += 1
+                    return self.huns.analyze(word)
+                def __getattr__(self, name):
+                    return getattr(self.huns, name)
+
+            bulk_stemmer = Stem(dialect, script)
+            bulk_stemmer.huns = BulkHunspell(bulk_stemmer.huns)
+            self.assertEqual([sorted(stems) for stems in bulk_stemmer.stem_many(words)], [sorted(stems) for stems in stemmer.stem_many(words)])
+            self.assertEqual([sorted(lemmata) for lemmata in bulk_stemmer.lemmatize_many(words)], [sorted(lemmata) for lemmata in stemmer.lemmatize_many(words)])
+            self.assertGreater(bulk_stemmer.huns.calls, 0)
+            self.assertEqual(bulk_stemmer.huns.single_calls, 0)
+
+    def test_correct_spelling_many(self):
+        stemmer = Stem("Sorani", "Arabic")
+        words = ["سوتاندبووت", "گوڵ", "سوتاندبووت", "دیتبامن"]
+        corrections, timed_out = stemmer.correct_spelling_many(words, max_suggestions=3)
+        self.assertEqual(corrections, [(is_correct, suggestions[:3]) for is_correct, suggestions in map(stemmer.correct_spelling, words)])
+        self.assertEqual(timed_out, [])
+
+        # the pool is kept whatever the number of incorrect words
+        pool = stemmer.suggestion_pool
+        stemmer.correct_spelling_many(["دیتبامنن"] + words)
+        self.assertIs(stemmer.suggestion_pool, pool)
+        stemmer.close()
+
+        # the time budget of a word starts when a worker takes it and only the worker which exceeds it is replaced
+        pool = stem.SuggestionPool(2, (SlowHunspell(), None, None, []))
+        suggestions, timed_out = pool.suggest(["slow", "a", "b", "c", "d"], timeout=1)
+        self.assertEqual(timed_out, ["slow"])
+        self.assertEqual(suggestions, {"slow": [], "a": ["as"], "b": ["bs"], "c": ["cs"], "d": ["ds"]})
+        self.assertEqual(pool.replaced, 1)
+        processes = [worker["process"] for worker in pool.workers]
+        self.assertEqual(pool.suggest(["e"], timeout=1), ({"e": ["es"]}, []))
+        self.assertEqual([worker["process"] for worker in pool.workers], processes)
+        pool.close()
+
+        # the workers which load the dictionary apply its runtime changes
+        stem.init_suggestion_worker(None, "kmr-Latn", klpt.get_data("data/"), [["add", "kompîtur", "mal"], ["remove", "malan"]])
+        self.assertTrue(stem.worker_hunspell.spell("kompîturên"))
+        self.assertNotIn("malan", stem.suggest_in_worker("malanx"))
+        self.assertIn("malan", Stem("Kurmanji", "Latin").correct_spelling("malanx")[1])
+
+        # the workers are not terminated by close() while in use
+        results = list()
+        thread = threading.Thread(target=lambda: results.append(stemmer.correct_spelling_many(words, max_suggestions=3)), daemon=True)
+        thread.start()
+        stemmer.close()
+        thread.join(60)
+        self.assertEqual(results[0][0][0], (False, stemmer.correct_spelling(words[0])[1][:3]))
+        stemmer.close()
+
+    def test_suggestion_index(self):
+        with tempfile.TemporaryDirectory() as directory:
+            words = {"kirin": 10, "kirîn": 2, "kir": 5, "birin": 1, "xwendekar": 3}
+            build_deletion_index(words, os.path.join(directory, "words.index"), max_distance=2)
+            index = DeletionIndex(os.path.join(directory, "words.index"))
+            self.assertEqual(index.lookup("kirn"), ["kirin", "kir", "kirîn", "birin"])
+            self.assertEqual(index.lookup("kirn", max_distance=1, max_suggestions=2), ["kirin", "kir"])
+            self.assertEqual(index.lookup("xwendkra"), ["xwendekar"])
+            self.assertEqual(index.lookup("xyz"), [])
+            index.close()
+            self.assertEqual(edit_distance("xwendkar", "xwendekar"), 1)
+            self.assertEqual(edit_distance("ab", "ba"), 1)
+            self.assertEqual(edit_distance("kitten", "sitting", max_distance=1), 2)
+
+            stemmer = Stem("Sorani", "Arabic", suggestion_index=os.path.join(directory, "ckb-Arab.index"))
+            self.assertTrue(os.path.exists(os.path.join(directory, "ckb-Arab.index")))
+            self.assertEqual(stemmer.correct_spelling("ماڵەکە"), (True, []))
+            is_correct, suggestions = stemmer.correct_spelling("کتێبخانەە", max_suggestions=3)
+            self.assertFalse(is_correct)
+            self.assertEqual(suggestions[0], "کتێبخانە")
+            self.assertLessEqual(len(suggestions), 3)
+            self.assertEqual(stemmer.correct_spelling_many(["کتێبخانەە"], max_suggestions=3), ([(False, suggestions)], []))
+            stemmer.deletion_index.close()
+
+            # the additional words can be given by a generator and are validated
+            stemmer = Stem("Kurmanji", "Latin")
+            stemmer.build_suggestion_index(os.path.join(directory, "kmr-Latn.index"), (word for word in ["malan", "xyzq"]), max_distance=1)
+            index = DeletionIndex(os.path.join(directory, "kmr-Latn.index"))
+            self.assertIn("malan", index.lookup("malanx", max_distance=1))
+            self.assertNotIn("xyzq", index.lookup("xyzq", max_distance=1))
+            index.close()
+
+    def test_dictionary_registry(self):
+        stem.unload("Kurmanji", "Latin")
+        stemmers = list()
+        threads = [threading.Thread(target=lambda: stemmers.append(Stem("Kurmanji", "Latin"))) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(set(id(stemmer.huns) for stemmer in stemmers)), 1)
+        self.assertIs(stem.preload("Kurmanji", "Latin")["huns"], stemmers[0].huns)
+
+        stem.unload("Kurmanji", "Latin")
+        self.assertIsNot(Stem("Kurmanji", "Latin").huns, stemmers[0].huns)
+        self.assertEqual(stemmers[0].stem("dibêjim"), Stem("Kurmanji", "Latin").stem("dibêjim"))
+        self.assertRaises(Exception, stem.preload, "Sorani", "Latin")
+
+    def test_pool(self):
+        stemmer, pooled_stemmer = Stem("Sorani", "Arabic"), Stem("Sorani", "Arabic", pool_size=2)
+        self.assertIsNot(pooled_stemmer.huns, stemmer.huns)
+        self.assertIsNone(stemmer.pool_info())
+        words = list(self.test_cases["lemmatize"]["Sorani"]["Arabic"])
+        expected = [(sorted(stemmer.stem(word)), sorted(stemmer.lemmatize(word)), stemmer.check_spelling(word)) for word in words]
+        results = list()
+        threads = [threading.Thread(target=lambda: results.append([(sorted(pooled_stemmer.stem(word)), sorted(pooled_stemmer.lemmatize(word)), 
+                    pooled_stemmer.check_spelling(word)) for word in words])) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, [expected] * 4)
+        self.assertEqual(pooled_stemmer.pool_info()["available"], 2)
+        self.assertGreater(pooled_stemmer.pool_info()["checkouts"], 0)
+
+        # the dictionary of all the handles is modified
+        pooled_stemmer.huns.add("زمانەوانییەکەکان")
+        self.assertTrue(all(pooled_stemmer.huns.spell("زمانەوانییەکەکان") for _ in range(4)))
+
+        # concurrent modifiers do not wait for each other's handles, even if each one has checked out some of them
+        checkout = pooled_stemmer.huns.checkout
+        def slow_checkout():
+            handle = checkout()
+            time.sleep(0.01)
+            return handle
+        pooled_stemmer.huns.checkout = slow_checkout
+        threads = [threading.Thread(target=lambda: [pooled_stemmer.huns.add("زمانەوانی%d" % i) for i in range(5)], daemon=True) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(30)
+        self.assertFalse(any(thread.is_alive() for thread in threads))
+        self.assertEqual(pooled_stemmer.pool_info()["available"], 2)
+
+    def test_add_word(self):
+        with tempfile.TemporaryDirectory() as directory:
+            user_dictionary = os.path.join(directory, "user.dic")
+            # a pool is used not to modify the dictionary shared by the other tests
+            stemmer = Stem("Kurmanji", "Latin", cache_size=10, pool_size=1, user_dictionary=user_dictionary)
+            self.assertFalse(stemmer.check_spelling("kompîturên"))
+            self.assertTrue(stemmer.add_word("kompîtur", example="mal"))
+            self.assertTrue(stemmer.check_spelling("kompîturên"))
+            self.assertTrue(stemmer.add_word("wîkîpediya"))
+            self.assertTrue(stemmer.check_spelling("wîkîpediya"))
+            # a failed change is not saved
+            self.assertFalse(stemmer.add_word("wîkî", example="xxxxxx"))
+
+            # the removed words are not recognized even if Hunspell does not support forbidden words
+            self.assertTrue(stemmer.check_spelling("malan"))
+            self.assertTrue(stemmer.remove_word("wîkîpediya"))
+            self.assertTrue(stemmer.remove_word("malan"))
+            self.assertFalse(stemmer.check_spelling("wîkîpediya"))
+            self.assertFalse(stemmer.check_spelling("malan"))
+            self.assertEqual(stemmer.analyze("malan"), [])
+            self.assertEqual(stemmer.analyze_many(["malan"]), [[]])
+            self.assertEqual(stemmer.check_many(["malan", "mal"]), [False, True])
+            with open(user_dictionary, encoding = "utf-8") as f:
+                self.assertEqual(f.read(), "add\tkompîtur\tmal\nadd\twîkîpediya\nremove\twîkîpediya\nremove\tmalan\n")
+
+            # the changes are loaded from the user dictionary
+            stemmer = Stem("Kurmanji", "Latin", pool_size=1, user_dictionary=user_dictionary)
+            self.assertTrue(stemmer.check_spelling("kompîturên"))
+            self.assertFalse(stemmer.check_spelling("malan"))
+            self.assertFalse(Stem("Kurmanji", "Latin", pool_size=1).check_spelling("kompîturên"))
+
+        # a user dictionary is applied once to a shared dictionary, without clearing the caches of the other instances
+        with tempfile.TemporaryDirectory() as directory:
+            user_dictionary = os.path.join(directory, "user.dic")
+            with open(user_dictionary, "w", encoding = "utf-8") as f:
+                f.write("remove\tkompîturên\n")
+            stem.unload("Kurmanji", "Latin")
+            try:
+                stemmer = Stem("Kurmanji", "Latin", cache_size=10, user_dictionary=user_dictionary)
+                stemmer.check_spelling("mal")
+                Stem("Kurmanji", "Latin", user_dictionary=user_dictionary)
+                self.assertEqual(stemmer.cache_info()["size"], 1)
+                self.assertEqual(stemmer.dictionary["changes"], [["remove", "kompîturên"]])
+                self.assertIn(os.path.abspath(user_dictionary), stem.preload("Kurmanji", "Latin")["user_dictionaries"])
+            finally:
+                stem.unload("Kurmanji", "Latin")
+
+    def test_forms_of(self):
+        with tempfile.TemporaryDirectory() as directory:
+            build_inverted_index({"kirin": ["kirin", "dikim", "kir"], "mal": ["malan", "mal"]}, os.path.join(directory, "words.index"))
+            index = InvertedIndex(os.path.join(directory, "words.index"))
+            self.assertEqual(index.get("kirin"), ["dikim", "kir", "kirin"])
+            self.assertIsNone(index.get("xwendin"))
+            self.assertEqual(len(index), 2)
+            index.close()
+
+            stemmer = Stem("Sorani", "Arabic", forms_index=os.path.join(directory, "forms.index"))
+            words = list(self.test_cases["lemmatize"]["Sorani"]["Arabic"])
+            stemmer.build_forms_index(os.path.join(directory, "forms.index"), words)
+            for word in words:
+                for lemma in stemmer.lemmatize(word):
+                    self.assertIn(word, stemmer.forms_of(lemma))
+            self.assertEqual(stemmer.forms_of("xwendin"), [])
+            stemmer.forms_index.close()
+
+            # the default index includes the inflected forms generated by the affix rules of the dictionary
+            stemmer = Stem("Kurmanji", "Latin", forms_index=os.path.join(directory, "kmr.index"))
+            self.assertRaises(ValueError, stemmer.forms_of, "mal")
+            self.assertFalse(os.path.exists(os.path.join(directory, "kmr.index")))
+            self.assertIn("malan", stemmer.dictionary_forms())
+            stemmer.build_forms_index(os.path.join(directory, "kmr.index"))
+            self.assertTrue({"mal", "malan", "malê", "malek"}.issubset(stemmer.forms_of("mal")))
+            self.assertCountEqual(os.listdir(directory), ["words.index", "forms.index", "kmr.index"])
+            stemmer.forms_index.close()
+
+            # the pairs are sorted by chunks in temporary files
+            pairs = [("kirin", "kir"), ("mal", "malan"), ("kirin", "dikim"), ("mal", "malan"), ("kirin", "kir"), ("mal", "mal")]
+            build_inverted_index_from_pairs(iter(pairs), os.path.join(directory, "pairs.index"), chunk_size=2)
+            index = InvertedIndex(os.path.join(directory, "pairs.index"))
+            self.assertEqual([index.get("kirin"), index.get("mal")], [["dikim", "kir"], ["mal", "malan"]])
+            index.close()
+        self.assertRaises(ValueError, Stem("Sorani", "Arabic").forms_of, "گوڵ")
+
 if __name__ == "__main__":
     unittest.main()
@@ -3,8 +3,10 @@
 
 import sys
 sys.path.append('../klpt')
+import os
+import tempfile
 import unittest
-from klpt.tokenize import Tokenize
+from klpt.tokenize import Tokenize, Token
 import json
 import klpt
 
@@ -35,6 +37,39 @@ class TestTokenize(unittest.TestCase):
                                                                             keep_form=test_case["parameters"]["keep_form"]),
                                                                             test_case["cases"][case])
 
+    def test_word_tokenize(self):
+        for dialect in self.options["dialects"]:
+            for script in self.options["scripts"]:
+                if (dialect == "Sorani" and script == "Arabic") or (dialect == "Kurmanji" and script == "Latin"): # otherwise, not supported currently
+                    tokenizer = Tokenize(dialect, script)
+                    for case in self.test_cases["word_tokenize"][dialect][script]:
+                        self.assertEqual(tokenizer.word_tokenize(case), self.test_cases["word_tokenize"][dialect][script][case])
+
+    def test_word_spans(self):
+        tokenizer = Tokenize("Sorani", "Arabic")
+        sentence = "پێمانگی حەز-و-ناهەزێکیان لەدواکەوتن."
+        self.assertEqual(list(tokenizer.word_spans(sentence)), [Token("پێ", 0, 2, "prefix"), Token("مانگی", 2, 7, "word"), Token("حەز-و-ناهەز", 8, 19, "word"),
+                                                                Token("ێک", 19, 21, "suffix"), Token("یان", 21, 24, "suffix"), Token("لە", 25, 27, "prefix"),
+                                                                Token("دواکەوتن", 27, 35, "mwe", "دوا-کەوتن"), Token(".", 35, 36, "unknown")])
+        for dialect in self.options["dialects"]:
+            for script in self.options["scripts"]:
+                if (dialect == "Sorani" and script == "Arabic") or (dialect == "Kurmanji" and script == "Latin"): # otherwise, not supported currently
+                    tokenizer = Tokenize(dialect, script)
+                    for case in self.test_cases["word_tokenize"][dialect][script]:
+                        for token in tokenizer.word_spans(case):
+                            self.assertEqual(case[token.start: token.end], token.text)
+
+    def test_word_cache(self):
+        tokenizer = Tokenize("Kurmanji", "Latin", cache_size=2)
+        uncached_tokenizer = Tokenize("Kurmanji", "Latin", cache_size=0)
+        for case in self.test_cases["word_tokenize"]["Kurmanji"]["Latin"]:
+            self.assertEqual(tokenizer.word_tokenize(case), uncached_tokenizer.word_tokenize(case))
+            self.assertEqual(tokenizer.word_tokenize(case), uncached_tokenizer.word_tokenize(case))
+        cache_info = tokenizer.word_cache.info()
+        self.assertLessEqual(cache_info["size"], 2)
+        self.assertGreater(cache_info["evictions"], 0)
+        self.assertEqual(uncached_tokenizer.word_cache.info()["size"], 0)
+
     def test_sent_tokenize(self):
         for dialect in self.options["dialects"]:
             for script in self.options["scripts"]:
@@ -43,6 +78,37 @@ class TestTokenize(unittest.TestCase):
                         tokenizer = Tokenize(dialect, script)
                         # print(case)
                         self.assertCountEqual(tokenizer.sent_tokenize(case), self.test_cases["sent_tokenize"][dialect][script][case])
+                        for sentence, start, end in tokenizer.sent_spans(case):
+                            self.assertEqual(case[start: end].replace("\n", " "), sentence)
+
+    def test_sent_tokenize_stream(self):
+        for dialect in self.options["dialects"]:
+            for script in self.options["scripts"]:
+                if (dialect == "Sorani" and script == "Arabic") or (dialect == "Kurmanji" and script == "Latin"): # otherwise, not supported currently
+                    tokenizer = Tokenize(dialect, script)
+                    text = "\n".join(self.test_cases["sent_tokenize"][dialect][script])
+                    for chunk_size in [1, 7, 100]:
+                        chunks = [text[i: i + chunk_size] for i in range(0, len(text), chunk_size)]
+                        self.assertEqual(list(tokenizer.sent_tokenize_stream(chunks)), tokenizer.sent_tokenize(text))
+
+    def test_sent_tokenize_stream_file(self):
+        tokenizer = Tokenize("Kurmanji", "Latin")
+        sentences = list(self.test_cases["sent_tokenize"]["Kurmanji"]["Latin"])
+        with tempfile.TemporaryDirectory() as directory:
+            # paragraphs separated by blank lines and lines with Windows line endings
+            for separator in ["\n\n", "\r\n"]:
+                text = separator.join(sentences * 20)
+                path = os.path.join(directory, "text.txt")
+                with open(path, "w", encoding = "utf-8", newline = "") as f:
+                    f.write(text)
+                with open(path, encoding = "utf-8", newline = "") as f:
+                    self.assertEqual(list(tokenizer.sent_tokenize_stream(f)), tokenizer.sent_tokenize(text))
+
+                # the sentences are yielded before the end of the stream
+                lines = iter(text.splitlines(keepends = True))
+                stream = tokenizer.sent_tokenize_stream(lines)
+                next(stream)
+                self.assertGreater(len(list(lines)), 0)
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file